@@ -13738,6 +13738,13 @@ CREATE INDEX film_work_creation_rating_idx ON content.film_work USING btree (cre
 CREATE UNIQUE INDEX film_work_genre_idx ON content.genre_film_work USING btree (film_work_id, genre_id);
 
 
+--
+-- Name: film_work_modified_id_idx; Type: INDEX; Schema: content; Owner: postgres
+--
+
+CREATE INDEX film_work_modified_id_idx ON content.film_work USING btree (modified, id);
+
+
 --
 -- Name: film_work_person_role_idx; Type: INDEX; Schema: content; Owner: postgres
 --
@@ -13745,6 +13752,34 @@ CREATE UNIQUE INDEX film_work_genre_idx ON content.genre_film_work USING btree (
 CREATE UNIQUE INDEX film_work_person_role_idx ON content.person_film_work USING btree (film_work_id, person_id, role);
 
 
+--
+-- Name: genre_film_work_genre_idx; Type: INDEX; Schema: content; Owner: postgres
+--
+
+CREATE INDEX genre_film_work_genre_idx ON content.genre_film_work USING btree (genre_id);
+
+
+--
+-- Name: genre_modified_id_idx; Type: INDEX; Schema: content; Owner: postgres
+--
+
+CREATE INDEX genre_modified_id_idx ON content.genre USING btree (modified, id);
+
+
+--
+-- Name: person_film_work_person_idx; Type: INDEX; Schema: content; Owner: postgres
+--
+
+CREATE INDEX person_film_work_person_idx ON content.person_film_work USING btree (person_id);
+
+
+--
+-- Name: person_modified_id_idx; Type: INDEX; Schema: content; Owner: postgres
+--
+
+CREATE INDEX person_modified_id_idx ON content.person USING btree (modified, id);
+
+
 --
 -- Name: auth_group_name_a6ea08ec_like; Type: INDEX; Schema: public; Owner: postgres
 --
@@ -0,0 +1,150 @@
+"""
+Синтетический каталог в локальном Postgres для замеров ETL (см. benchmarks.etl).
+Фильмы, персоны и жанры создаются на стороне Postgres через generate_series, каждому фильму
+назначается roles участников (по кругу актёр, режиссёр, сценарист) и genres-per-film жанров.
+
+Запуск из каталога elastic, таблицы схемы content предварительно очищаются:
+    python -m benchmarks.catalog --films 100000 --persons 20000 --genres 30 --roles 12 --genres-per-film 3
+С --explain после создания каталога печатаются планы запросов извлечения изменений индекса movies
+для страницы из последних batch-size изменённых строк каждой таблицы-источника.
+"""
+
+import argparse
+import time
+from contextlib import closing
+
+from config.postgres import PostgresClient
+from config.settings import settings
+from etl.extract.source_indexes import ensure_source_indexes
+from main import ETL_CONFIGS
+from psycopg.sql import SQL, Identifier
+from state.state import Cursor
+
+TRUNCATE = """
+    TRUNCATE content.person_film_work, content.genre_film_work, content.film_work, content.person, content.genre
+"""
+
+INSERT_GENRES = """
+    INSERT INTO content.genre (id, name, description, created, modified)
+    SELECT gen_random_uuid(), 'Genre ' || n, 'Synthetic genre ' || n, now(), now()
+    FROM generate_series(1, %(genres)s) AS n
+"""
+
+INSERT_PERSONS = """
+    INSERT INTO content.person (id, full_name, created, modified)
+    SELECT gen_random_uuid(), 'Person ' || n, now(), now()
+    FROM generate_series(1, %(persons)s) AS n
+"""
+
+INSERT_FILMS = """
+    INSERT INTO content.film_work (id, title, description, creation_date, rating, type, created, modified)
+    SELECT gen_random_uuid(),
+           'Film ' || n,
+           repeat('Synthetic film description ' || n || '. ', 8),
+           date '1950-01-01' + n %% 27000,
+           round((random() * 10)::numeric, 1),
+           'movie',
+           now(),
+           now()
+    FROM generate_series(1, %(films)s) AS n
+"""
+
+INSERT_PERSON_FILM_WORK = """
+    WITH films AS (SELECT id, row_number() OVER (ORDER BY id) AS n FROM content.film_work),
+         persons AS (SELECT array_agg(id ORDER BY id) AS ids FROM content.person)
+    INSERT INTO content.person_film_work (id, person_id, film_work_id, role, created)
+    SELECT gen_random_uuid(),
+           persons.ids[1 + (films.n * %(roles)s + k) %% cardinality(persons.ids)],
+           films.id,
+           (ARRAY['actor', 'director', 'writer'])[1 + k %% 3],
+           now()
+    FROM films, persons, generate_series(0, %(roles)s - 1) AS k
+"""
+
+INSERT_GENRE_FILM_WORK = """
+    WITH films AS (SELECT id, row_number() OVER (ORDER BY id) AS n FROM content.film_work),
+         genres AS (SELECT array_agg(id ORDER BY id) AS ids FROM content.genre)
+    INSERT INTO content.genre_film_work (id, genre_id, film_work_id, created)
+    SELECT gen_random_uuid(), genres.ids[1 + (films.n + k) %% cardinality(genres.ids)], films.id, now()
+    FROM films, genres, generate_series(0, %(genres_per_film)s - 1) AS k
+"""
+
+
+def generate(
+    postgres_client: PostgresClient, films: int, persons: int, genres: int, roles: int, genres_per_film: int
+) -> None:
+    """Заменяет содержимое схемы content синтетическим каталогом одной транзакцией."""
+    if roles > persons or genres_per_film > genres:
+        raise ValueError("Участников и жанров фильма не может быть больше, чем персон и жанров в каталоге")
+
+    params = {
+        "films": films,
+        "persons": persons,
+        "genres": genres,
+        "roles": roles,
+        "genres_per_film": genres_per_film,
+    }
+    for query in (
+        TRUNCATE,
+        INSERT_GENRES,
+        INSERT_PERSONS,
+        INSERT_FILMS,
+        INSERT_PERSON_FILM_WORK,
+        INSERT_GENRE_FILM_WORK,
+    ):
+        postgres_client.cursor.execute(query, params)
+    postgres_client.connection.commit()
+
+    postgres_client.cursor.execute("ANALYZE content.film_work, content.person, content.genre")
+    postgres_client.cursor.execute("ANALYZE content.person_film_work, content.genre_film_work")
+    postgres_client.connection.commit()
+
+
+def explain(postgres_client: PostgresClient, batch_size: int) -> None:
+    """Печатает планы EXPLAIN ANALYZE страницы изменений каждого источника индекса movies."""
+    movies = next(config for config in ETL_CONFIGS if config.index.value == "movies")
+    for producer in movies.producers:
+        postgres_client.cursor.execute(
+            SQL("SELECT modified, id FROM {table} ORDER BY modified DESC, id DESC OFFSET %s LIMIT 1").format(
+                table=Identifier("content", producer.table.value)
+            ),
+            (batch_size,),
+        )
+        row = postgres_client.cursor.fetchone()
+        cursor = Cursor.from_row(row) if row else Cursor()
+        query = producer.query(cursor.modified, cursor.id, batch_size)
+
+        postgres_client.cursor.execute(SQL("EXPLAIN (ANALYZE, BUFFERS) ") + query)
+        print(f"{producer.table.value}:")
+        for plan_row in postgres_client.cursor.fetchall():
+            print(f"  {plan_row['QUERY PLAN']}")
+        postgres_client.connection.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--films", type=int, default=100000, help="количество фильмов")
+    parser.add_argument("--persons", type=int, default=20000, help="количество персон")
+    parser.add_argument("--genres", type=int, default=30, help="количество жанров")
+    parser.add_argument("--roles", type=int, default=12, help="участников в каждом фильме")
+    parser.add_argument("--genres-per-film", type=int, default=3, help="жанров у каждого фильма")
+    parser.add_argument("--explain", action="store_true", help="напечатать планы запросов извлечения изменений")
+    parser.add_argument("--batch-size", type=int, default=settings.batch_size, help="размер страницы для --explain")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with closing(PostgresClient(settings.postgres_dsn)) as postgres_client:
+        generate(postgres_client, args.films, args.persons, args.genres, args.roles, args.genres_per_film)
+    print(
+        f"каталог создан за {time.perf_counter() - started:.1f} с: {args.films} фильмов, {args.persons} персон, "
+        f"{args.genres} жанров, {args.films * args.roles} ролей, {args.films * args.genres_per_film} связей с жанрами"
+    )
+
+    if args.explain:
+        ensure_source_indexes(settings.postgres_dsn)
+        with closing(PostgresClient(settings.postgres_dsn)) as postgres_client:
+            explain(postgres_client, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Замер ETL на каталоге из benchmarks.catalog: извлечение, преобразование и загрузка по отдельности
+и весь конвейер. Для каждого этапа сообщаются строки в секунду и пиковый RSS процесса с дочерними
+процессами (пиковый RSS не убывает, поэтому это максимум с начала замера), для загрузки — p50 и p99
+времени bulk_load одной пачки. Отдельные этапы держат все пачки в памяти.
+Документы загружаются во временный индекс {index}_benchmark, который удаляется после замера.
+Отчёт сохраняется в JSON вместе с коммитом, с --compare печатается изменение относительно прошлого отчёта.
+
+Запуск из каталога elastic при локальных Postgres и Elasticsearch из .env:
+    python -m benchmarks.catalog --films 100000 --persons 20000
+    python -m benchmarks.etl --index movies --output benchmark.json --compare previous.json
+"""
+
+import argparse
+import json
+import math
+import resource
+import subprocess
+import time
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from config import ElasticsearchClient, PostgresClient
+from config.settings import Settings, settings
+from etl.etl import make_loader
+from etl.extract.data_extract import PostgresExtractor
+from etl.load.data_loader import ElasticsearchLoader
+from etl.pipeline import Pipeline
+from etl.transform.data_transform import DataTransform
+from main import ETL_CONFIGS
+from models.etl import ETL
+from state.memory_storage import MemoryStorage
+from state.state import Cursor, State
+
+
+def peak_rss_mb() -> float:
+    """Пиковый RSS процесса и самого большого из завершённых дочерних процессов, МБ (ru_maxrss в КБ в Linux)."""
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, children) / 1024
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Перцентиль по ближайшему рангу."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+@dataclass
+class StageResult:
+    rows: int
+    seconds: float
+    peak_rss_mb: float
+    latencies: list[float] = field(default_factory=list)
+
+    def report(self) -> dict[str, Any]:
+        report = {
+            "rows": self.rows,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows / self.seconds, 1) if self.seconds else None,
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+        }
+        if self.latencies:
+            report["bulk_p50_ms"] = round(percentile(self.latencies, 50) * 1000, 1)
+            report["bulk_p99_ms"] = round(percentile(self.latencies, 99) * 1000, 1)
+        return report
+
+
+def measure(work: Callable[[], int]) -> StageResult:
+    """Выполняет этап, work возвращает количество обработанных строк."""
+    started = time.perf_counter()
+    rows = work()
+    return StageResult(rows=rows, seconds=time.perf_counter() - started, peak_rss_mb=peak_rss_mb())
+
+
+class TimedLoader:
+    """Загрузчик, запоминающий время каждого вызова bulk_load."""
+
+    def __init__(self, loader: ElasticsearchLoader):
+        self.loader = loader
+        self.latencies: list[float] = []
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.loader, name)
+
+    def bulk_load(self, *args: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return self.loader.bulk_load(*args)
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+
+@dataclass
+class Benchmark:
+    etl: ETL
+    settings: Settings
+    postgres_client: PostgresClient
+    elasticsearch_client: ElasticsearchClient
+
+    @property
+    def index(self) -> str:
+        """Временный индекс для загрузки."""
+        return f"{self.etl.index.value}_benchmark"
+
+    def run(self) -> dict[str, dict[str, Any]]:
+        """Замеряет этапы по отдельности, затем весь конвейер."""
+        batches = []
+        extract = measure(lambda: sum(len(batch) for batch in self.extract(batches)))
+        print(f"извлечение: {extract.report()}")
+
+        documents = []
+        with closing(self.transformer()) as transformer:
+            transform = measure(lambda: sum(len(batch) for batch in self.transform(transformer, batches, documents)))
+        print(f"преобразование: {transform.report()}")
+
+        loader = self.loader()
+        load = measure(lambda: self.load(loader, documents))
+        load.latencies = loader.latencies
+        print(f"загрузка: {load.report()}")
+
+        loader = self.loader()
+        with closing(self.transformer()) as transformer:
+            end_to_end = measure(lambda: self.pipeline(transformer, loader))
+        end_to_end.latencies = loader.latencies
+        print(f"весь конвейер: {end_to_end.report()}")
+
+        self.elasticsearch_client.connection.indices.delete(index=self.index, ignore_unavailable=True)
+        return {
+            "extract": extract.report(),
+            "transform": transform.report(),
+            "load": load.report(),
+            "end_to_end": end_to_end.report(),
+        }
+
+    def extractor(self) -> PostgresExtractor:
+        """Извлечение с начальных позиций в состоянии в памяти, то есть полная загрузка."""
+        state = State(storage=MemoryStorage())
+        state.set_states({state_key: Cursor().dumps() for state_key in self.etl.state_keys})
+        return PostgresExtractor(
+            postgres_client=self.postgres_client,
+            state=state,
+            etl=self.etl,
+            batch_size=self.settings.batch_size,
+            query=self.etl.query,
+            streaming=self.settings.extract_streaming,
+            itersize=self.settings.extract_itersize,
+        )
+
+    def transformer(self) -> DataTransform:
+        return DataTransform(
+            model=self.etl.model,
+            index=self.etl.index.value,
+            workers=self.settings.transform_workers,
+            fast=self.settings.transform_fast,
+            validate_sample=self.settings.transform_validate_sample,
+        )
+
+    def loader(self) -> TimedLoader:
+        """Загрузчик во вновь созданный временный индекс, без хешей документов."""
+        loader = make_loader(self.etl, self.settings, self.elasticsearch_client, State(storage=MemoryStorage()), None)
+        indices = self.elasticsearch_client.connection.indices
+        indices.delete(index=self.index, ignore_unavailable=True)
+        indices.create(index=self.index, **loader.index_body)
+        loader.use_version(self.index)
+        return TimedLoader(loader)
+
+    def extract(self, batches: list[list[dict]]) -> Iterator[list[dict]]:
+        for data, _, _ in self.extractor().extract():
+            batches.append(data)
+            yield data
+
+    @staticmethod
+    def transform(
+        transformer: DataTransform, batches: list[list[dict]], documents: list[list[dict]]
+    ) -> Iterator[list[dict]]:
+        for batch in transformer.transform_batches(batches):
+            documents.append(batch)
+            yield batch
+
+    def load(self, loader: TimedLoader, documents: list[list[dict]]) -> int:
+        for batch in documents:
+            loader.bulk_load(batch, self.etl.index.value, None)
+        return self.count()
+
+    def pipeline(self, transformer: DataTransform, loader: TimedLoader) -> int:
+        Pipeline(
+            extractor=self.extractor(),
+            transformer=transformer,
+            loader=loader,
+            queue_size=self.settings.pipeline_queue_size,
+        ).run()
+        return self.count()
+
+    def count(self) -> int:
+        """Документов во временном индексе после загрузки."""
+        self.elasticsearch_client.connection.indices.refresh(index=self.index)
+        return self.elasticsearch_client.connection.count(index=self.index)["count"]
+
+
+def commit() -> str | None:
+    """Текущий коммит репозитория, если замер запущен из рабочей копии git."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(stages: dict[str, dict[str, Any]], previous: dict[str, Any]) -> None:
+    """Печатает изменение строк в секунду и p99 загрузки относительно прошлого отчёта."""
+    print(f"сравнение с {previous.get('commit')}:")
+    for stage, result in stages.items():
+        before = previous["stages"].get(stage, {})
+        for metric in ("rows_per_second", "bulk_p99_ms"):
+            if result.get(metric) and before.get(metric):
+                change = result[metric] / before[metric]
+                print(f"  {stage}.{metric}: {before[metric]} → {result[metric]} (x{change:.2f})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--index", choices=[config.index.value for config in ETL_CONFIGS], default="movies")
+    parser.add_argument("--output", type=Path, default=Path("benchmark.json"), help="файл отчёта")
+    parser.add_argument("--compare", type=Path, help="прошлый отчёт для сравнения")
+    args = parser.parse_args()
+
+    etl = next(config for config in ETL_CONFIGS if config.index.value == args.index)
+    with closing(PostgresClient(settings.postgres_dsn)) as postgres_client, closing(
+        ElasticsearchClient(settings.elasticsearch_dsn)
+    ) as elasticsearch_client:
+        stages = Benchmark(etl, settings, postgres_client, elasticsearch_client).run()
+
+    report = {
+        "commit": commit(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "index": args.index,
+        "settings": settings.model_dump(
+            include={
+                "batch_size",
+                "extract_streaming",
+                "extract_itersize",
+                "pipeline_queue_size",
+                "bulk_thread_count",
+                "bulk_chunk_size",
+                "transform_workers",
+                "transform_fast",
+            }
+        ),
+        "stages": stages,
+    }
+    args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2))
+    print(f"отчёт сохранён в {args.output}")
+
+    if args.compare:
+        compare(stages, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
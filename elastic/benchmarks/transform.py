@@ -0,0 +1,69 @@
+"""
+Сравнение преобразования пачек в потоке ETL, в пуле процессов и быстрым путём без валидации.
+
+Запуск из каталога elastic:
+    python -m benchmarks.transform --rows 20000 --actors 300 --workers 4
+"""
+
+import argparse
+import time
+from uuid import uuid4
+
+from etl.transform.data_transform import DataTransform
+from models.movie import MovieDTO
+
+
+def make_movie(actors: int) -> dict:
+    """Строка фильма в том виде, в каком её отдаёт запрос get_films_by_ids_query."""
+    people = [{"id": str(uuid4()), "full_name": f"Person {number}"} for number in range(actors)]
+    return {
+        "id": uuid4(),
+        "title": "The Star",
+        "description": "New World",
+        "imdb_rating": 8.5,
+        "genre": [{"id": str(uuid4()), "name": "Comedy"}],
+        "actors": people,
+        "directors": people[:2],
+        "writers": people[:5],
+        "actors_names": [person["full_name"] for person in people],
+        "directors_names": [person["full_name"] for person in people[:2]],
+        "writers_names": [person["full_name"] for person in people[:5]],
+    }
+
+
+def measure(transformer: DataTransform, batches: list[list[dict]]) -> tuple[float, list[list[dict]]]:
+    """Время преобразования всех пачек и результат."""
+    started = time.perf_counter()
+    result = list(transformer.transform_batches(batches))
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="количество фильмов")
+    parser.add_argument("--actors", type=int, default=300, help="актёров в каждом фильме")
+    parser.add_argument("--batch-size", type=int, default=1000, help="размер пачки")
+    parser.add_argument("--workers", type=int, default=4, help="процессов в пуле")
+    args = parser.parse_args()
+
+    rows = [make_movie(args.actors) for _ in range(args.rows)]
+    batches = [rows[start : start + args.batch_size] for start in range(0, len(rows), args.batch_size)]
+
+    in_thread, expected = measure(DataTransform(model=MovieDTO), batches)
+    print(f"в потоке: {in_thread:.2f} с, {args.rows / in_thread:.0f} строк/с")
+
+    pool = DataTransform(model=MovieDTO, workers=args.workers)
+    try:
+        measure(pool, batches[:1])
+        in_pool, result = measure(pool, batches)
+    finally:
+        pool.close()
+    print(f"пул из {args.workers} процессов: {in_pool:.2f} с, {args.rows / in_pool:.0f} строк/с")
+
+    fast, _ = measure(DataTransform(model=MovieDTO, fast=True), batches)
+    print(f"быстрый путь без валидации: {fast:.2f} с, {args.rows / fast:.0f} строк/с")
+    print(f"ускорение: x{in_thread / in_pool:.2f}, порядок сохранён: {result == expected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,18 @@
-from .base import BaseConfig
-from .elasticsearch import ElasticsearchClient
-from .postgres import PostgresClient
-from .redis import RedisClient
+from .base import AsyncBaseConfig, BaseConfig
+from .elasticsearch import AsyncElasticsearchClient, ElasticsearchClient
+from .postgres import AsyncPostgresClient, AsyncPostgresPool, PooledPostgresClient, PostgresClient, PostgresPool
+from .redis import AsyncRedisClient, RedisClient
 
-__all__ = ("BaseConfig", "ElasticsearchClient", "PostgresClient", "RedisClient")
+__all__ = (
+    "AsyncBaseConfig",
+    "AsyncElasticsearchClient",
+    "AsyncPostgresClient",
+    "AsyncPostgresPool",
+    "AsyncRedisClient",
+    "BaseConfig",
+    "ElasticsearchClient",
+    "PooledPostgresClient",
+    "PostgresClient",
+    "PostgresPool",
+    "RedisClient",
+)
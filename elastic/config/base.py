@@ -1,25 +1,91 @@
 import abc
+import threading
 
 from pydantic import AnyUrl
 
 
 class BaseConfig(abc.ABC):
-    """Базовый класс для клиента."""
+    """
+    Базовый класс для клиента.
+    Созданное соединение (клиент с пулом соединений) запоминается и переиспользуется,
+    новое создаётся, только если прежнего нет или оно не прошло проверку healthy().
+    Клиентом пользуются потоки планировщика, поэтому создание соединения выполняется под блокировкой.
+    """
 
     def __init__(self, dsn: AnyUrl, connect: any = None):
         self.dsn = dsn
         self.connect = connect
+        self.connects = 0
+        self._lock = threading.Lock()
 
     @abc.abstractmethod
     def reconnect(self) -> any:
         """Переподключить соединение"""
 
+    def healthy(self) -> bool:
+        """Можно ли переиспользовать текущее соединение."""
+        return True
+
     def close(self) -> None:
         """Закрыть соединение клиента."""
-        if self.connection:
-            self.connection.close()
+        if self.connect:
+            self.connect.close()
+            self.connect = None
 
     @property
     def connection(self) -> any:
         """Получить/восстановить соединение."""
-        return self.connect if self.connect else self.reconnect()
+        if self.connect and self.healthy():
+            return self.connect
+
+        with self._lock:
+            # Пока поток ждал блокировку, соединение мог создать другой поток.
+            if not self.connect or not self.healthy():
+                self.connect = self.reconnect()
+                self.connects += 1
+            return self.connect
+
+    def stats(self) -> dict[str, int]:
+        """Сколько раз соединение создавалось."""
+        return {"connects": self.connects}
+
+
+class AsyncBaseConfig(abc.ABC):
+    """Базовый класс для асинхронного клиента. Соединение открывается в open() или в async with."""
+
+    def __init__(self, dsn: AnyUrl, connect: any = None):
+        self.dsn = dsn
+        self.connect = connect
+        self.connects = 0
+
+    @abc.abstractmethod
+    async def reconnect(self) -> any:
+        """Переподключить соединение"""
+
+    async def open(self) -> "AsyncBaseConfig":
+        """Открыть соединение, если оно ещё не открыто."""
+        if not self.connect:
+            self.connect = await self.reconnect()
+            self.connects += 1
+        return self
+
+    async def close(self) -> None:
+        """Закрыть соединение клиента."""
+        if self.connect:
+            await self.connect.close()
+            self.connect = None
+
+    async def __aenter__(self) -> "AsyncBaseConfig":
+        return await self.open()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def connection(self) -> any:
+        """Открытое соединение."""
+        return self.connect
+
+    def stats(self) -> dict[str, int]:
+        """Сколько раз соединение создавалось."""
+        return {"connects": self.connects}
@@ -1,22 +1,35 @@
 import logging
 from logging import config as logging_config
 
-from elasticsearch import Elasticsearch
+from elasticsearch import AsyncElasticsearch, Elasticsearch
 from elasticsearch.exceptions import ConnectionError
-from utils.backoff import backoff
+from utils.backoff import async_backoff, backoff
 from utils.logger import LOGGING_CONFIG
 
-from .base import BaseConfig
+from .base import AsyncBaseConfig, BaseConfig
 
 logger = logging.getLogger(__name__)
 logging_config.dictConfig(LOGGING_CONFIG)
 
 
 class ElasticsearchClient(BaseConfig):
-    """Класс для работы с Elasticsearch."""
+    """
+    Класс для работы с Elasticsearch.
+    Один клиент — один транспорт с пулом keep-alive соединений к узлам, общий для всех потоков.
+    """
 
     @backoff(ConnectionError)
     def reconnect(self):
         """Подключение к Elasticsearch."""
         logger.info("Попытка подключения к Elasticsearch с dsn: %s", self.dsn)
         return Elasticsearch(str(self.dsn))
+
+
+class AsyncElasticsearchClient(AsyncBaseConfig):
+    """Асинхронный клиент Elasticsearch."""
+
+    @async_backoff(ConnectionError)
+    async def reconnect(self) -> AsyncElasticsearch:
+        """Подключение к Elasticsearch."""
+        logger.info("Попытка подключения к Elasticsearch с dsn: %s", self.dsn)
+        return AsyncElasticsearch(str(self.dsn))
@@ -1,14 +1,18 @@
 import logging
+from contextlib import asynccontextmanager, contextmanager
 from logging import config as logging_config
+from typing import AsyncIterator, Iterator
 
 import psycopg
+from psycopg import AsyncCursor, AsyncServerCursor, Cursor, ServerCursor
 from psycopg.errors import ConnectionFailure
 from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
 from pydantic import PostgresDsn
-from utils.backoff import backoff
+from utils.backoff import async_backoff, backoff
 from utils.logger import LOGGING_CONFIG
 
-from .base import BaseConfig
+from .base import AsyncBaseConfig, BaseConfig
 
 logger = logging.getLogger(__name__)
 logging_config.dictConfig(LOGGING_CONFIG)
@@ -19,12 +23,140 @@ class PostgresClient(BaseConfig):
 
     def __init__(self, dsn: PostgresDsn, connect=None):
         super().__init__(dsn, connect)
-        self.cursor = self.connection.cursor(row_factory=dict_row)
+        self._cursor = None
 
     @backoff(ConnectionFailure)
     def reconnect(self):
         """Подключение к PostgreSQL."""
         logger.info("Попытка подключения к PostgreSQL с dsn: %s", self.dsn)
-        self.connect = psycopg.connect(str(self.dsn))
-        self.cursor = self.connection.cursor(row_factory=dict_row)
-        return self.connection
+        return psycopg.connect(str(self.dsn))
+
+    def healthy(self) -> bool:
+        """Соединение не закрыто и не разорвано."""
+        return not self.connect.closed and not self.connect.broken
+
+    @property
+    def cursor(self) -> Cursor:
+        """Курсор текущего соединения, после переподключения создаётся заново."""
+        connection = self.connection
+        if self._cursor is None or self._cursor.connection is not connection:
+            self._cursor = connection.cursor(row_factory=dict_row)
+        return self._cursor
+
+    def server_cursor(self, name: str) -> ServerCursor:
+        """Именованный (серверный) курсор для потокового чтения результата."""
+        return self.connection.cursor(name=name, row_factory=dict_row)
+
+
+class PooledPostgresClient(PostgresClient):
+    """
+    Клиент на соединении из пула. Разорванное соединение не заменяется новым в обход пула:
+    запрос завершается ошибкой, а пул отбрасывает соединение, когда оно к нему возвращается.
+    """
+
+    def reconnect(self):
+        raise psycopg.OperationalError("Соединение из пула разорвано")
+
+
+def pool_stats(pool: ConnectionPool | AsyncConnectionPool | None) -> dict[str, int]:
+    """
+    Статистика пула: выдачи, ожидания, созданные и потерянные соединения.
+    connects — созданные пулом соединения, reuses — выдачи уже открытых соединений.
+    """
+    if pool is None:
+        return {"connects": 0, "reuses": 0}
+    stats = pool.get_stats()
+    connects = stats.get("connections_num", 0)
+    return {"connects": connects, "reuses": max(stats.get("requests_num", 0) - connects, 0)} | stats
+
+
+class PostgresPool(BaseConfig):
+    """
+    Пул соединений PostgreSQL.
+    Соединение проверяется при выдаче из пула, разорванные соединения заменяются новыми.
+    """
+
+    def __init__(self, dsn: PostgresDsn, min_size: int = 1, max_size: int = 4):
+        super().__init__(dsn)
+        self.min_size = min_size
+        self.max_size = max_size
+
+    def reconnect(self) -> ConnectionPool:
+        """Открывает пул соединений."""
+        logger.info("Открытие пула соединений PostgreSQL (%s-%s) с dsn: %s", self.min_size, self.max_size, self.dsn)
+        return ConnectionPool(
+            str(self.dsn),
+            min_size=self.min_size,
+            max_size=self.max_size,
+            check=ConnectionPool.check_connection,
+            name="etl",
+            open=True,
+        )
+
+    @contextmanager
+    def client(self) -> Iterator[PostgresClient]:
+        """Клиент на соединении из пула. При выходе соединение возвращается в пул, транзакция завершается."""
+        with self.connection.connection() as connection:
+            yield PooledPostgresClient(self.dsn, connect=connection)
+
+    def stats(self) -> dict[str, int]:
+        """Статистика пула, см. pool_stats."""
+        return pool_stats(self.connect)
+
+
+class AsyncPostgresClient(AsyncBaseConfig):
+    """Асинхронный клиент PostgreSQL."""
+
+    def __init__(self, dsn: PostgresDsn, connect=None):
+        super().__init__(dsn, connect)
+        self._cursor = None
+
+    @async_backoff(ConnectionFailure)
+    async def reconnect(self) -> psycopg.AsyncConnection:
+        """Подключение к PostgreSQL."""
+        logger.info("Попытка подключения к PostgreSQL с dsn: %s", self.dsn)
+        return await psycopg.AsyncConnection.connect(str(self.dsn))
+
+    @property
+    def cursor(self) -> AsyncCursor:
+        """Курсор открытого соединения."""
+        if self._cursor is None or self._cursor.connection is not self.connection:
+            self._cursor = self.connection.cursor(row_factory=dict_row)
+        return self._cursor
+
+    def server_cursor(self, name: str) -> AsyncServerCursor:
+        """Именованный (серверный) курсор для потокового чтения результата."""
+        return self.connection.cursor(name=name, row_factory=dict_row)
+
+
+class AsyncPostgresPool(AsyncBaseConfig):
+    """Асинхронный вариант PostgresPool."""
+
+    def __init__(self, dsn: PostgresDsn, min_size: int = 1, max_size: int = 4):
+        super().__init__(dsn)
+        self.min_size = min_size
+        self.max_size = max_size
+
+    async def reconnect(self) -> AsyncConnectionPool:
+        """Открывает пул соединений."""
+        logger.info("Открытие пула соединений PostgreSQL (%s-%s) с dsn: %s", self.min_size, self.max_size, self.dsn)
+        pool = AsyncConnectionPool(
+            str(self.dsn),
+            min_size=self.min_size,
+            max_size=self.max_size,
+            check=AsyncConnectionPool.check_connection,
+            name="etl",
+            open=False,
+        )
+        await pool.open()
+        return pool
+
+    @asynccontextmanager
+    async def client(self) -> AsyncIterator[AsyncPostgresClient]:
+        """Клиент на соединении из пула, см. PostgresPool.client."""
+        async with self.connection.connection() as connection:
+            yield AsyncPostgresClient(self.dsn, connect=connection)
+
+    def stats(self) -> dict[str, int]:
+        """Статистика пула, см. pool_stats."""
+        return pool_stats(self.connect)
@@ -2,25 +2,38 @@ import logging
 from logging import config as logging_config
 
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
 from redis.exceptions import ConnectionError
-from redis.typing import EncodableT, KeyT
-from utils.backoff import backoff
+from redis.typing import EncodableT, FieldT, KeyT
+from utils.backoff import async_backoff, backoff
 from utils.logger import LOGGING_CONFIG
 
-from .base import BaseConfig
+from .base import AsyncBaseConfig, BaseConfig
 
 logger = logging.getLogger(__name__)
 logging_config.dictConfig(LOGGING_CONFIG)
 
+HEALTH_CHECK_INTERVAL = 30
+
 
 class RedisClient(BaseConfig):
-    """Конфигурация и операции клиента Redis."""
+    """
+    Конфигурация и операции клиента Redis.
+    Клиент держит пул соединений, общий для всех потоков; соединение, простоявшее дольше
+    HEALTH_CHECK_INTERVAL секунд, проверяется командой PING перед использованием.
+    """
 
     @backoff(ConnectionError)
     def reconnect(self) -> Redis:
         """Переподключение к Redis, если соединение отсутствует."""
         logger.info("Попытка подключения к Redis...")
-        redis_client = Redis(host=self.dsn.host, port=int(self.dsn.port), db=self.dsn.path[1:])
+        redis_client = Redis(
+            host=self.dsn.host,
+            port=int(self.dsn.port),
+            db=self.dsn.path[1:],
+            health_check_interval=HEALTH_CHECK_INTERVAL,
+            socket_keepalive=True,
+        )
         logger.info("Соединение с Redis выполнено успешно!")
         return redis_client
 
@@ -29,12 +42,103 @@ class RedisClient(BaseConfig):
         """Устанавливает значение в Redis."""
         logger.debug(f"Устанавливаем ключ: {key} со значением: {value}")
         self.connection.set(key, value, *args, **kwargs)
-        logger.info(f"Ключ {key} установлен успешно.")
+        logger.debug(f"Ключ {key} установлен успешно.")
 
     @backoff(ConnectionError)
     def get(self, key: KeyT) -> bytes | None:
         """Получает значение из Redis."""
         logger.debug(f"Получаем значение для ключа: {key}")
         value = self.connection.get(key)
-        logger.info(f"Получено значение для ключа {key}: {value}")
+        logger.debug(f"Получено значение для ключа {key}: {value}")
         return value
+
+    @backoff(ConnectionError)
+    def mset(self, mapping: dict[KeyT, EncodableT]) -> None:
+        """Устанавливает несколько значений одной командой."""
+        logger.debug(f"Устанавливаем ключи: {list(mapping)}")
+        self.connection.mset(mapping)
+
+    @backoff(ConnectionError)
+    def mget(self, keys: list[KeyT]) -> list[bytes | None]:
+        """Получает значения нескольких ключей одной командой."""
+        logger.debug(f"Получаем значения для ключей: {keys}")
+        return self.connection.mget(keys)
+
+    @backoff(ConnectionError)
+    def hmget(self, name: KeyT, keys: list[FieldT]) -> list[bytes | None]:
+        """Получает значения полей хеша Redis."""
+        logger.debug(f"Получаем {len(keys)} полей хеша: {name}")
+        return self.connection.hmget(name, keys)
+
+    @backoff(ConnectionError)
+    def hset(self, name: KeyT, mapping: dict[FieldT, EncodableT]) -> None:
+        """Устанавливает значения полей хеша Redis."""
+        logger.debug(f"Устанавливаем {len(mapping)} полей хеша: {name}")
+        self.connection.hset(name, mapping=mapping)
+
+    @backoff(ConnectionError)
+    def delete(self, key: KeyT) -> None:
+        """Удаляет ключ из Redis."""
+        logger.debug(f"Удаляем ключ: {key}")
+        self.connection.delete(key)
+
+
+class AsyncRedisClient(AsyncBaseConfig):
+    """Асинхронный клиент Redis."""
+
+    @async_backoff(ConnectionError)
+    async def reconnect(self) -> AsyncRedis:
+        """Подключение к Redis."""
+        logger.info("Попытка подключения к Redis...")
+        redis_client = AsyncRedis(
+            host=self.dsn.host,
+            port=int(self.dsn.port),
+            db=self.dsn.path[1:],
+            health_check_interval=HEALTH_CHECK_INTERVAL,
+            socket_keepalive=True,
+        )
+        await redis_client.ping()
+        logger.info("Соединение с Redis выполнено успешно!")
+        return redis_client
+
+    @async_backoff(ConnectionError)
+    async def set(self, key: KeyT, value: EncodableT, *args, **kwargs) -> None:
+        """Устанавливает значение в Redis."""
+        logger.debug(f"Устанавливаем ключ: {key} со значением: {value}")
+        await self.connection.set(key, value, *args, **kwargs)
+
+    @async_backoff(ConnectionError)
+    async def get(self, key: KeyT) -> bytes | None:
+        """Получает значение из Redis."""
+        logger.debug(f"Получаем значение для ключа: {key}")
+        return await self.connection.get(key)
+
+    @async_backoff(ConnectionError)
+    async def mset(self, mapping: dict[KeyT, EncodableT]) -> None:
+        """Устанавливает несколько значений одной командой."""
+        logger.debug(f"Устанавливаем ключи: {list(mapping)}")
+        await self.connection.mset(mapping)
+
+    @async_backoff(ConnectionError)
+    async def mget(self, keys: list[KeyT]) -> list[bytes | None]:
+        """Получает значения нескольких ключей одной командой."""
+        logger.debug(f"Получаем значения для ключей: {keys}")
+        return await self.connection.mget(keys)
+
+    @async_backoff(ConnectionError)
+    async def hmget(self, name: KeyT, keys: list[FieldT]) -> list[bytes | None]:
+        """Получает значения полей хеша Redis."""
+        logger.debug(f"Получаем {len(keys)} полей хеша: {name}")
+        return await self.connection.hmget(name, keys)
+
+    @async_backoff(ConnectionError)
+    async def hset(self, name: KeyT, mapping: dict[FieldT, EncodableT]) -> None:
+        """Устанавливает значения полей хеша Redis."""
+        logger.debug(f"Устанавливаем {len(mapping)} полей хеша: {name}")
+        await self.connection.hset(name, mapping=mapping)
+
+    @async_backoff(ConnectionError)
+    async def delete(self, key: KeyT) -> None:
+        """Удаляет ключ из Redis."""
+        logger.debug(f"Удаляем ключ: {key}")
+        await self.connection.delete(key)
@@ -10,6 +10,26 @@ class Settings(BaseSettings):
     redis_dsn: RedisDsn
     batch_size: int
     timeout: float
+    extract_streaming: bool = True
+    extract_itersize: int = 2000
+    pipeline_queue_size: int = 4
+    bulk_thread_count: int = 1
+    bulk_chunk_size: int = 500
+    bulk_max_chunk_bytes: int = 100 * 1024 * 1024
+    indexes_path: str = "etl_indexes"
+    transform_workers: int = 0
+    transform_fast: bool = False
+    transform_validate_sample: float = 0.0
+    document_hashes: str = "redis"
+    change_feed: bool = True
+    change_feed_channel: str = "etl_changes"
+    change_feed_timeout: float = 300
+    scheduler_workers: int = 2
+    scheduler_batches_per_run: int = 50
+    etl_runtime: str = "threads"
+    state_flush_every: int = 1
+    metrics_port: int = 8001
+    trace_file: str = ""
 
     class Config:
         env_file = ".env"
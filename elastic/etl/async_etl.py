@@ -0,0 +1,138 @@
+import asyncio
+import json
+import logging
+from contextlib import AsyncExitStack, closing
+from logging import config as logging_config
+from pathlib import Path
+
+from config import AsyncElasticsearchClient, AsyncPostgresPool, AsyncRedisClient
+from config.settings import Settings
+from etl.async_pipeline import AsyncPipeline
+from etl.async_scheduler import AsyncJob, AsyncScheduler
+from etl.extract.async_extract import AsyncPostgresExtractor
+from etl.extract.change_feed import ChangeFeed
+from etl.extract.source_indexes import ensure_source_indexes
+from etl.load.async_loader import AsyncElasticsearchLoader
+from etl.transform.data_transform import DataTransform
+from models.etl import ETL
+from state.base_storage import AsyncBaseHashStorage
+from state.memory_storage import AsyncMemoryHashStorage
+from state.redis_storage import AsyncRedisHashStorage, AsyncRedisStorage
+from state.state import AsyncState, Cursor
+from utils.logger import LOGGING_CONFIG
+from utils.metrics import register_clients
+
+logger = logging.getLogger(__name__)
+logging_config.dictConfig(LOGGING_CONFIG)
+
+
+def async_etl(etl_configs: list[ETL], settings: Settings) -> None:
+    """ETL процесс для всех мапперов в цикле событий asyncio."""
+    asyncio.run(run_etl(etl_configs, settings))
+
+
+async def run_etl(etl_configs: list[ETL], settings: Settings) -> None:
+    """Асинхронный вариант etl.etl.etl на общих асинхронных соединениях."""
+
+    logger.info("Асинхронный ETL начат для индексов: %s", ", ".join(config.index.value for config in etl_configs))
+
+    async with AsyncExitStack() as stack:
+        elasticsearch_client = await stack.enter_async_context(AsyncElasticsearchClient(settings.elasticsearch_dsn))
+        redis_client = await stack.enter_async_context(AsyncRedisClient(settings.redis_dsn))
+        postgres_pool = await stack.enter_async_context(
+            AsyncPostgresPool(settings.postgres_dsn, max_size=settings.scheduler_workers)
+        )
+        change_feed = stack.enter_context(
+            closing(
+                ChangeFeed(
+                    dsn=settings.postgres_dsn,
+                    channel=settings.change_feed_channel,
+                    tables=list(dict.fromkeys(table for config in etl_configs for table in config.tables)),
+                )
+            )
+        )
+
+        register_clients(
+            {"postgres": postgres_pool, "redis": redis_client, "elasticsearch": elasticsearch_client}
+        )
+
+        await asyncio.to_thread(ensure_source_indexes, settings.postgres_dsn)
+
+        state = AsyncState(
+            storage=AsyncRedisStorage(redis_client=redis_client), flush_every=settings.state_flush_every
+        )
+        hashes = {
+            "redis": AsyncRedisHashStorage(redis_client=redis_client),
+            "memory": AsyncMemoryHashStorage(),
+        }.get(settings.document_hashes)
+
+        jobs = [
+            await build_job(config, settings, stack, elasticsearch_client, state, hashes)
+            for config in etl_configs
+        ]
+
+        if settings.change_feed:
+            await asyncio.to_thread(change_feed.start)
+
+        await AsyncScheduler(
+            jobs=jobs,
+            postgres_pool=postgres_pool,
+            workers=settings.scheduler_workers,
+            change_feed=change_feed,
+            poll_timeout=settings.timeout,
+            idle_timeout=settings.change_feed_timeout,
+            batches_per_run=settings.scheduler_batches_per_run,
+        ).run()
+
+
+async def build_job(
+    etl: ETL,
+    settings: Settings,
+    stack: AsyncExitStack,
+    elasticsearch_client: AsyncElasticsearchClient,
+    state: AsyncState,
+    hashes: AsyncBaseHashStorage | None,
+) -> AsyncJob:
+    """Собирает асинхронный конвейер индекса, см. etl.etl.build_job."""
+
+    cursors = await state.get_cursors(etl.state_keys)
+    await state.set_states({state_key: Cursor().dumps() for state_key, cursor in cursors.items() if not cursor})
+
+    transformer = stack.enter_context(
+        closing(
+            DataTransform(
+                model=etl.model,
+                index=etl.index.value,
+                workers=settings.transform_workers,
+                fast=settings.transform_fast,
+                validate_sample=settings.transform_validate_sample,
+            )
+        )
+    )
+
+    extractor = AsyncPostgresExtractor(
+        postgres_client=None,
+        state=state,
+        etl=etl,
+        batch_size=settings.batch_size,
+        query=etl.query,
+        streaming=settings.extract_streaming,
+        itersize=settings.extract_itersize,
+    )
+
+    loader = AsyncElasticsearchLoader(
+        client=elasticsearch_client,
+        state=state,
+        index=etl.index.value,
+        batch_size=settings.batch_size,
+        thread_count=settings.bulk_thread_count,
+        chunk_size=settings.bulk_chunk_size,
+        max_chunk_bytes=settings.bulk_max_chunk_bytes,
+        index_body=json.loads(Path(settings.indexes_path, f"{etl.index.value}.json").read_text()),
+        hashes=hashes,
+    )
+
+    pipeline = AsyncPipeline(
+        extractor=extractor, transformer=transformer, loader=loader, queue_size=settings.pipeline_queue_size
+    )
+    return AsyncJob(etl=etl, state=state, extractor=extractor, loader=loader, pipeline=pipeline)
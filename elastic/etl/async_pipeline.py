@@ -0,0 +1,92 @@
+import asyncio
+import logging
+from collections import deque
+from contextlib import aclosing
+from dataclasses import dataclass
+from logging import config as logging_config
+from typing import Any
+
+from etl.extract.async_extract import AsyncPostgresExtractor
+from etl.load.async_loader import AsyncElasticsearchLoader
+from etl.transform.data_transform import DataTransform
+from utils.logger import LOGGING_CONFIG
+from utils.metrics import ROWS_EXTRACTED
+from utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+logging_config.dictConfig(LOGGING_CONFIG)
+
+DONE = object()
+
+
+@dataclass
+class AsyncPipeline:
+    """
+    Конвейер extract → transform → load в цикле событий.
+    Этапы — задачи asyncio, связанные очередями не больше queue_size пачек, как в Pipeline.
+    Преобразование выполняется в потоке или в пуле процессов и не блокирует чтение и загрузку.
+    """
+
+    extractor: AsyncPostgresExtractor
+    transformer: DataTransform
+    loader: AsyncElasticsearchLoader
+    queue_size: int = 4
+
+    async def run(self, max_batches: int | None = None) -> bool:
+        """Выполняет цикл ETL, см. Pipeline.run."""
+        extracted = asyncio.Queue(maxsize=self.queue_size)
+        transformed = asyncio.Queue(maxsize=self.queue_size)
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                stages = [
+                    group.create_task(self._extract(extracted), name="extract"),
+                    group.create_task(self._transform(extracted, transformed), name="transform"),
+                ]
+
+                finished = True
+                number = 0
+                while (item := await transformed.get()) is not DONE:
+                    await self.load(*item)
+                    number += 1
+                    if max_batches and number >= max_batches:
+                        finished = False
+                        break
+
+                for stage in stages:
+                    stage.cancel()
+        except ExceptionGroup as errors:
+            logger.error("Ошибка в конвейере для индекса %s", self.loader.index)
+            raise errors.exceptions[0]
+
+        return finished
+
+    async def load(self, data: list[dict], state_key: str, cursor: Any) -> None:
+        """Загружает пачку в Elasticsearch и сдвигает состояние."""
+        with tracer.span("bulk_load", index=self.loader.index, documents=len(data)):
+            failures = await self.loader.bulk_load(data, state_key, cursor)
+        for failure in failures or []:
+            logger.error("Ошибка для документа ID=%s (%s): %s", failure.id, failure.status, failure.error)
+
+    async def _extract(self, target: asyncio.Queue) -> None:
+        async with aclosing(self.extractor.extract()) as batches:
+            async for item in batches:
+                ROWS_EXTRACTED.labels(self.loader.index).inc(len(item[0]))
+                await target.put(item)
+        await target.put(DONE)
+
+    async def _transform(self, source: asyncio.Queue, target: asyncio.Queue) -> None:
+        """Преобразует пачки по порядку, в работе одновременно не больше workers + 1 пачек."""
+        pending = deque()
+
+        while (item := await source.get()) is not DONE:
+            data, state_key, cursor = item
+            pending.append((asyncio.ensure_future(self.transformer.transform_async(data)), state_key, cursor))
+            if len(pending) > self.transformer.workers:
+                transformed, state_key, cursor = pending.popleft()
+                await target.put((await transformed, state_key, cursor))
+
+        while pending:
+            transformed, state_key, cursor = pending.popleft()
+            await target.put((await transformed, state_key, cursor))
+        await target.put(DONE)
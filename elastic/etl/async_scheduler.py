@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from logging import config as logging_config
+from threading import Event
+
+from config.postgres import AsyncPostgresClient, AsyncPostgresPool
+from etl.async_pipeline import AsyncPipeline
+from etl.extract.async_extract import AsyncPostgresExtractor
+from etl.load.async_loader import AsyncElasticsearchLoader
+from etl.scheduler import Scheduler
+from models.etl import ETL
+from state.state import AsyncState, Cursor
+from utils.logger import LOGGING_CONFIG
+from utils.metrics import LAG_SECONDS
+from utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+logging_config.dictConfig(LOGGING_CONFIG)
+
+
+@dataclass
+class AsyncJob:
+    """Конвейер одного индекса в асинхронном планировщике."""
+
+    etl: ETL
+    state: AsyncState
+    extractor: AsyncPostgresExtractor
+    loader: AsyncElasticsearchLoader
+    pipeline: AsyncPipeline
+    due: bool = True
+    running: bool = False
+    turn: int = 0
+
+    async def run(self, postgres_client: AsyncPostgresClient, max_batches: int | None) -> bool:
+        """Выполняет цикл ETL индекса, см. Job.run."""
+        self.extractor.postgres_client = postgres_client
+
+        try:
+            with tracer.span("etl_run", index=self.etl.index.value):
+                finished = await self._run(max_batches)
+        finally:
+            await asyncio.to_thread(tracer.flush)
+
+        if finished:
+            for state_key in self.etl.state_keys:
+                LAG_SECONDS.labels(self.etl.index.value, state_key).set(0)
+        return finished
+
+    async def _run(self, max_batches: int | None) -> bool:
+        """Полная загрузка или обновление индекса, см. Job._run."""
+        if await self.loader.sharded_reindex_in_progress():
+            logger.info("Индекс %s загружается по диапазонам, запуск пропущен", self.etl.index.value)
+            return True
+
+        full_reindex = await self.loader.reindex_in_progress() or await self.loader.index_outdated()
+        full_reindex = full_reindex or await self.reset_requested()
+        if full_reindex:
+            await self.loader.begin_reindex(self.etl.state_keys)
+
+        try:
+            finished = await self.pipeline.run(max_batches)
+        finally:
+            await self.state.flush()
+            self.loader.use_version(None)
+
+        if full_reindex and finished:
+            await self.loader.finish_reindex()
+        return finished
+
+    async def reset_requested(self) -> bool:
+        """Все позиции сброшены на начало, а индекс не пуст, см. Job.reset_requested."""
+        cursors = await self.state.get_cursors(self.etl.state_keys)
+        return all(cursor == Cursor() for cursor in cursors.values()) and not await self.loader.index_empty()
+
+
+@dataclass
+class AsyncScheduler(Scheduler):
+    """
+    Планировщик конвейеров всех индексов в одном цикле событий.
+    Очередь и приоритеты те же, что у Scheduler: одновременно идёт не больше workers конвейеров,
+    каждому запуску выдаётся соединение из асинхронного пула. Подписка на изменения
+    работает в отдельном потоке и передаёт события в цикл.
+    """
+
+    jobs: list[AsyncJob]
+    postgres_pool: AsyncPostgresPool
+
+    async def run(self) -> None:
+        """Запускает конвейеры по изменениям и по таймеру, пока задачу не отменят."""
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+
+        stop = Event()
+        listener = asyncio.create_task(
+            asyncio.to_thread(
+                self.change_feed.listen, lambda table: loop.call_soon_threadsafe(events.put_nowait, table), stop
+            )
+        )
+        tasks = set()
+
+        self._next_poll = time.monotonic()
+        try:
+            while True:
+                if time.monotonic() >= self._next_poll:
+                    self._next_poll = self._poll()
+
+                for job in self.ready()[: self.workers - self.running()]:
+                    job.due, job.running = False, True
+                    task = asyncio.create_task(self._run_job(job, events))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+                try:
+                    event = await asyncio.wait_for(events.get(), timeout=max(self._next_poll - time.monotonic(), 0))
+                except asyncio.TimeoutError:
+                    continue
+                self._handle(event)
+        finally:
+            stop.set()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(listener, *tasks, return_exceptions=True)
+
+    async def _run_job(self, job: AsyncJob, events: asyncio.Queue) -> None:
+        finished = True
+        try:
+            async with self.postgres_pool.client() as postgres_client:
+                finished = await job.run(postgres_client, job.etl.batches_per_run or self.batches_per_run)
+        except Exception as e:
+            logger.error("❌  Ошибка в ETL процессе для индекса %s: %s", job.etl.index.value, str(e), exc_info=True)
+        finally:
+            events.put_nowait((job, finished))
@@ -1,64 +1,141 @@
+import json
 import logging
-import time
-from contextlib import closing
-from datetime import datetime
+from contextlib import ExitStack, closing
 from logging import config as logging_config
+from pathlib import Path
 
-from config import ElasticsearchClient, PostgresClient, RedisClient
+from config import ElasticsearchClient, PostgresPool, RedisClient
 from config.settings import Settings
-from elasticsearch.helpers import BulkIndexError
+from etl.extract.change_feed import ChangeFeed
 from etl.extract.data_extract import PostgresExtractor
+from etl.extract.source_indexes import ensure_source_indexes
 from etl.load.data_loader import ElasticsearchLoader
+from etl.pipeline import Pipeline
+from etl.scheduler import Job, Scheduler
 from etl.transform.data_transform import DataTransform
 from models.etl import ETL
-from state.redis_storage import RedisStorage
-from state.state import State
+from state.base_storage import BaseHashStorage
+from state.memory_storage import MemoryHashStorage
+from state.redis_storage import RedisHashStorage, RedisStorage
+from state.state import Cursor, State
 from utils.logger import LOGGING_CONFIG
+from utils.metrics import register_clients
 
 logger = logging.getLogger(__name__)
 logging_config.dictConfig(LOGGING_CONFIG)
 
 
-def etl(etl: "ETL", settings: Settings) -> None:
-    """ETL процесс для конкретного маппера."""
+def etl(etl_configs: list[ETL], settings: Settings) -> None:
+    """ETL процесс для всех мапперов на общих соединениях."""
 
-    logger.info("%s ETL начат", etl.index.value)
+    logger.info("ETL начат для индексов: %s", ", ".join(config.index.value for config in etl_configs))
 
-    with closing(ElasticsearchClient(settings.elasticsearch_dsn)) as elasticsearch_client, closing(
-        PostgresClient(settings.postgres_dsn)
-    ) as postgres_client, closing(RedisClient(settings.redis_dsn)) as redis_client:
-        state = State(storage=RedisStorage(redis_client=redis_client))
-
-        if not state.get_state(key=str(etl.index.value)):
-            state.set_state(key=str(etl.index.value), value=str(datetime.min))
+    with ExitStack() as stack:
+        elasticsearch_client = stack.enter_context(closing(ElasticsearchClient(settings.elasticsearch_dsn)))
+        redis_client = stack.enter_context(closing(RedisClient(settings.redis_dsn)))
+        postgres_pool = stack.enter_context(
+            closing(PostgresPool(settings.postgres_dsn, max_size=settings.scheduler_workers))
+        )
+        change_feed = stack.enter_context(
+            closing(
+                ChangeFeed(
+                    dsn=settings.postgres_dsn,
+                    channel=settings.change_feed_channel,
+                    tables=list(dict.fromkeys(table for config in etl_configs for table in config.tables)),
+                )
+            )
+        )
 
-        extractor = PostgresExtractor(
-            postgres_client=postgres_client,
-            state=state,
-            etl=etl,
-            batch_size=settings.batch_size,
-            query=etl.query,
+        register_clients(
+            {"postgres": postgres_pool, "redis": redis_client, "elasticsearch": elasticsearch_client}
         )
 
-        transformer = DataTransform(model=etl.model)
+        ensure_source_indexes(settings.postgres_dsn)
+
+        state = State(storage=RedisStorage(redis_client=redis_client), flush_every=settings.state_flush_every)
+        hashes = {
+            "redis": RedisHashStorage(redis_client=redis_client),
+            "memory": MemoryHashStorage(),
+        }.get(settings.document_hashes)
+
+        jobs = [
+            build_job(config, settings, stack, elasticsearch_client, state, hashes)
+            for config in etl_configs
+        ]
+
+        if settings.change_feed:
+            change_feed.start()
+
+        Scheduler(
+            jobs=jobs,
+            postgres_pool=postgres_pool,
+            workers=settings.scheduler_workers,
+            change_feed=change_feed,
+            poll_timeout=settings.timeout,
+            idle_timeout=settings.change_feed_timeout,
+            batches_per_run=settings.scheduler_batches_per_run,
+        ).run()
 
-        loader = ElasticsearchLoader(
-            client=elasticsearch_client, state=state, index=etl.index.value, batch_size=settings.batch_size
+
+def build_job(
+    etl: ETL,
+    settings: Settings,
+    stack: ExitStack,
+    elasticsearch_client: ElasticsearchClient,
+    state: State,
+    hashes: BaseHashStorage | None,
+) -> Job:
+    """Собирает конвейер индекса. Соединение с Postgres планировщик выдаёт из пула при каждом запуске."""
+
+    cursors = state.get_cursors(etl.state_keys)
+    state.set_states({state_key: Cursor().dumps() for state_key, cursor in cursors.items() if not cursor})
+
+    transformer = stack.enter_context(
+        closing(
+            DataTransform(
+                model=etl.model,
+                index=etl.index.value,
+                workers=settings.transform_workers,
+                fast=settings.transform_fast,
+                validate_sample=settings.transform_validate_sample,
+            )
         )
+    )
+
+    extractor = PostgresExtractor(
+        postgres_client=None,
+        state=state,
+        etl=etl,
+        batch_size=settings.batch_size,
+        query=etl.query,
+        streaming=settings.extract_streaming,
+        itersize=settings.extract_itersize,
+    )
+
+    loader = make_loader(etl, settings, elasticsearch_client, state, hashes)
+
+    pipeline = Pipeline(
+        extractor=extractor, transformer=transformer, loader=loader, queue_size=settings.pipeline_queue_size
+    )
+    return Job(etl=etl, state=state, extractor=extractor, loader=loader, pipeline=pipeline)
+
 
-        while True:
-            for data, last_modified in extractor.extract():
-                if data:
-                    transformed_data = transformer.data_transform(data)
-                    try:
-                        loader.bulk_load(transformed_data, last_modified)
-                    except BulkIndexError as e:
-                        logger.error("Ошибка при индексации в Elasticsearch: %s", e)
-                        for error in e.errors:
-                            logger.error(
-                                "Ошибка для документа ID=%s: %s", error["index"]["_id"], error["index"]["error"]
-                            )
-
-            logger.info("%s ETL завершён, засыпаем на %s с", etl.index.value, settings.timeout)
-
-            time.sleep(settings.timeout)
+def make_loader(
+    etl: ETL,
+    settings: Settings,
+    elasticsearch_client: ElasticsearchClient,
+    state: State,
+    hashes: BaseHashStorage | None,
+) -> ElasticsearchLoader:
+    """Загрузчик индекса с настройками bulk и телом индекса из indexes_path."""
+    return ElasticsearchLoader(
+        client=elasticsearch_client,
+        state=state,
+        index=etl.index.value,
+        batch_size=settings.batch_size,
+        thread_count=settings.bulk_thread_count,
+        chunk_size=settings.bulk_chunk_size,
+        max_chunk_bytes=settings.bulk_max_chunk_bytes,
+        index_body=json.loads(Path(settings.indexes_path, f"{etl.index.value}.json").read_text()),
+        hashes=hashes,
+    )
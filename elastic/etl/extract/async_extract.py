@@ -0,0 +1,145 @@
+import logging
+from dataclasses import dataclass
+from logging import config as logging_config
+from typing import AsyncIterator, Callable
+from uuid import UUID
+
+from config.postgres import AsyncPostgresClient
+from etl.extract.query import Query
+from models.etl import ETL, Producer
+from psycopg import AsyncCursor
+from psycopg.errors import ConnectionFailure
+from psycopg.sql import SQL
+from state.state import AsyncState, Cursor
+from utils.backoff import async_backoff
+from utils.logger import LOGGING_CONFIG
+from utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+logging_config.dictConfig(LOGGING_CONFIG)
+
+
+@dataclass
+class AsyncPostgresExtractor:
+    """
+    Асинхронный вариант PostgresExtractor на psycopg.AsyncConnection.
+    Пачки, ключи состояния и позиции те же, что у синхронного извлечения.
+    """
+
+    postgres_client: AsyncPostgresClient | None
+    state: AsyncState
+    etl: ETL
+    batch_size: int
+    query: Callable[..., SQL]
+    streaming: bool = False
+    itersize: int = 2000
+
+    @async_backoff(ConnectionFailure)
+    async def check_modified(self, cursor: Cursor) -> str | None:
+        """Проверяет, были ли изменены данные в таблице после позиции cursor."""
+        table = self.etl.table.value
+        logger.info("Проверка изменений в таблице %s с предыдущей позиции %s", table, cursor)
+
+        with tracer.span("check_modified", table=table):
+            await self.postgres_client.cursor.execute(Query.check_modified(table, cursor.modified, cursor.id))
+            result = await self.postgres_client.cursor.fetchone()
+        await self.postgres_client.connection.commit()
+
+        if result is None:
+            logger.warning("Результат запроса пустой для таблицы %s", table)
+            return None
+
+        last_modified = result["last_modified"]
+        logger.info("Последнее изменение в таблице %s: %s", table, last_modified)
+        return last_modified
+
+    async def extract(self) -> AsyncIterator[tuple[list[dict], str, Cursor | None]]:
+        """Извлекает данные из Postgres: пачки с ключом состояния и позицией, как PostgresExtractor.extract."""
+        if self.etl.producers:
+            async for item in self.extract_produced():
+                yield item
+            return
+
+        cursor = await self.state.get_cursor(self.etl.index.value)
+
+        if await self.check_modified(cursor):
+            logger.info("Извлечение новых данных для %s", self.etl.index.value)
+
+            fetch = self.fetch_streaming if self.streaming else self.fetch
+            async for data in fetch(self.query(cursor.modified, cursor.id)):
+                yield data, self.etl.index.value, Cursor.from_row(data[-1])
+
+    async def extract_produced(self) -> AsyncIterator[tuple[list[dict], str, Cursor | None]]:
+        """Извлекает документы, затронутые изменениями во всех источниках индекса."""
+        for producer in self.etl.producers:
+            state_key = self.etl.state_key(producer.table)
+            loaded = set()
+
+            async for page in self.produce(producer, await self.state.get_cursor(state_key)):
+                ids = [doc_id for row in page for doc_id in row["doc_ids"] if doc_id not in loaded]
+                ids = list(dict.fromkeys(ids))
+                loaded.update(ids)
+
+                data = []
+                async for next_data in self.enrich(ids):
+                    if data:
+                        yield data, state_key, None
+                    data = next_data
+                yield data, state_key, Cursor.from_row(page[-1])
+
+    async def fetch(self, query: SQL) -> AsyncIterator[list[dict]]:
+        """Выполняет запрос клиентским курсором и отдаёт результат пачками."""
+        await self.execute(self.postgres_client.cursor, query)
+
+        while data := await self.fetchmany(self.postgres_client.cursor):
+            yield data
+
+        await self.postgres_client.connection.commit()
+
+    async def fetch_streaming(self, query: SQL) -> AsyncIterator[list[dict]]:
+        """Выполняет запрос серверным курсором и отдаёт результат пачками по batch_size."""
+        try:
+            async with self.postgres_client.server_cursor(f"{self.etl.index.value}_extract") as cursor:
+                cursor.itersize = self.itersize
+                await self.execute(cursor, query)
+
+                while data := await self.fetchmany(cursor):
+                    yield data
+        finally:
+            await self.postgres_client.connection.commit()
+
+    async def produce(self, producer: Producer, cursor: Cursor) -> AsyncIterator[list[dict]]:
+        """Постранично выбирает изменённые записи источника после позиции cursor по ключу (modified, id)."""
+        logger.info("Извлечение изменений %s для %s с позиции %s", producer.table.value, self.etl.index.value, cursor)
+
+        while True:
+            page = await self.fetchall(producer.query(cursor.modified, cursor.id, self.batch_size))
+
+            if not page:
+                break
+
+            yield page
+
+            cursor = Cursor.from_row(page[-1])
+
+    async def enrich(self, ids: list[UUID]) -> AsyncIterator[list[dict]]:
+        """Собирает документы по id пачками не больше batch_size, каждая пачка в своей транзакции."""
+        for start in range(0, len(ids), self.batch_size):
+            yield await self.fetchall(self.query(ids[start : start + self.batch_size]))
+
+    async def execute(self, cursor: AsyncCursor, query: SQL) -> None:
+        with tracer.span("execute", index=self.etl.index.value):
+            await cursor.execute(query)
+
+    async def fetchmany(self, cursor: AsyncCursor) -> list[dict]:
+        """Читает очередную пачку не больше batch_size строк."""
+        with tracer.span("fetchmany", index=self.etl.index.value):
+            return await cursor.fetchmany(self.batch_size)
+
+    async def fetchall(self, query: SQL) -> list[dict]:
+        """Выполняет запрос и читает весь результат в отдельной транзакции."""
+        await self.execute(self.postgres_client.cursor, query)
+        with tracer.span("fetchall", index=self.etl.index.value):
+            data = await self.postgres_client.cursor.fetchall()
+        await self.postgres_client.connection.commit()
+        return data
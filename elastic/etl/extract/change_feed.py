@@ -0,0 +1,112 @@
+import logging
+from dataclasses import dataclass, field
+from logging import config as logging_config
+from threading import Event
+from typing import Callable
+
+import psycopg
+from models.etl import Tables
+from psycopg.sql import SQL, Identifier, Literal
+from pydantic import PostgresDsn
+from utils.logger import LOGGING_CONFIG
+
+logger = logging.getLogger(__name__)
+logging_config.dictConfig(LOGGING_CONFIG)
+
+NOTIFY_TIMEOUT = 1.0
+
+# Событие вместо имени таблицы: подписка потеряна и не восстановлена.
+FEED_LOST = "etl:feed_lost"
+
+NOTIFY_FUNCTION = SQL(
+    """
+    CREATE OR REPLACE FUNCTION content.etl_notify() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        PERFORM pg_notify(TG_ARGV[0], TG_TABLE_NAME);
+        RETURN NULL;
+    END;
+    $$
+    """
+)
+
+NOTIFY_TRIGGER = SQL(
+    """
+    CREATE OR REPLACE TRIGGER {trigger}
+    AFTER INSERT OR UPDATE OR DELETE ON {table}
+    FOR EACH STATEMENT EXECUTE FUNCTION content.etl_notify({channel})
+    """
+)
+
+
+@dataclass
+class ChangeFeed:
+    """
+    Источник изменений на LISTEN/NOTIFY.
+    Триггеры на таблицах отправляют в канал имя изменённой таблицы, и цикл ETL
+    запускается сразу после изменения, а не по таймеру. Если триггеры поставить
+    или подписаться не удалось, планировщик опрашивает таблицы по таймеру.
+    """
+
+    dsn: PostgresDsn
+    channel: str
+    tables: list[Tables]
+    _connection: psycopg.Connection | None = field(default=None, init=False, repr=False)
+
+    @property
+    def active(self) -> bool:
+        """Подписка на канал работает."""
+        return self._connection is not None
+
+    def start(self) -> bool:
+        """Ставит триггеры на таблицы и подписывается на канал."""
+        connection = None
+        try:
+            connection = psycopg.connect(str(self.dsn), autocommit=True)
+            with connection.transaction():
+                connection.execute("SELECT pg_advisory_xact_lock(hashtext('content.etl_notify'))")
+                connection.execute(NOTIFY_FUNCTION)
+                for table in self.tables:
+                    connection.execute(
+                        NOTIFY_TRIGGER.format(
+                            trigger=Identifier(f"{table.value}_etl_notify"),
+                            table=Identifier("content", table.value),
+                            channel=Literal(self.channel),
+                        )
+                    )
+            connection.execute(SQL("LISTEN {channel}").format(channel=Identifier(self.channel)))
+        except psycopg.Error as error:
+            logger.warning("LISTEN/NOTIFY недоступен, изменения будут опрашиваться: %s", error)
+            if connection is not None:
+                connection.close()
+            return False
+
+        self._connection = connection
+        logger.info("Подписка на изменения %s в канале %s", [table.value for table in self.tables], self.channel)
+        return True
+
+    def listen(self, on_change: Callable[[str], None], stop: Event) -> None:
+        """
+        Передаёт в on_change имя каждой изменённой таблицы, пока не установлен stop.
+        Если подписка потеряна и восстановить её не удалось, передаёт FEED_LOST и возвращается:
+        дальше изменения опрашиваются.
+        """
+        names = {table.value for table in self.tables}
+
+        while self.active and not stop.is_set():
+            try:
+                for notify in self._connection.notifies(timeout=NOTIFY_TIMEOUT):
+                    if notify.payload in names:
+                        on_change(notify.payload)
+            except psycopg.OperationalError as error:
+                logger.warning("Подписка на изменения потеряна: %s", error)
+                self.close()
+                self.start()
+
+        if not stop.is_set():
+            on_change(FEED_LOST)
+
+    def close(self) -> None:
+        """Закрывает соединение подписки."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -1,16 +1,20 @@
 import logging
 from dataclasses import dataclass
+from itertools import islice
 from logging import config as logging_config
-from typing import Callable
+from typing import Callable, Iterator
+from uuid import UUID
 
 from config.postgres import PostgresClient
 from etl.extract.query import Query
-from models.etl import ETL
+from models.etl import ETL, Producer
+from psycopg import Cursor as PostgresCursor
 from psycopg.errors import ConnectionFailure
 from psycopg.sql import SQL
-from state.state import State
+from state.state import Cursor, State
 from utils.backoff import backoff
 from utils.logger import LOGGING_CONFIG
+from utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 logging_config.dictConfig(LOGGING_CONFIG)
@@ -18,39 +22,133 @@ logging_config.dictConfig(LOGGING_CONFIG)
 
 @dataclass
 class PostgresExtractor:
-    postgres_client: PostgresClient
+    postgres_client: PostgresClient | None
     state: State
     etl: ETL
     batch_size: int
-    query: Callable[[str], SQL]
+    query: Callable[..., SQL]
+    streaming: bool = False
+    itersize: int = 2000
 
     @backoff(ConnectionFailure)
-    def check_modified(self, prev_mod: str) -> str | None:
-        """Проверяет, были ли изменены данные в таблице."""
-        logger.info("Проверка изменений в таблице %s с предыдущей меткой времени %s", self.etl.table.value, prev_mod)
+    def check_modified(self, cursor: Cursor) -> str | None:
+        """Проверяет, были ли изменены данные в таблице после позиции cursor."""
+        table = self.etl.table.value
+        logger.info("Проверка изменений в таблице %s с предыдущей позиции %s", table, cursor)
 
-        self.postgres_client.cursor.execute(Query.check_modified(self.etl.table.value, prev_mod))
-
-        result = self.postgres_client.cursor.fetchone()
+        with tracer.span("check_modified", table=table):
+            self.postgres_client.cursor.execute(Query.check_modified(table, cursor.modified, cursor.id))
+            result = self.postgres_client.cursor.fetchone()
 
         if result is None:
-            logger.warning("Результат запроса пустой для таблицы %s", self.etl.table.value)
+            logger.warning("Результат запроса пустой для таблицы %s", table)
             return None
 
         last_modified = result["last_modified"]
-        logger.info("Последнее изменение в таблице %s: %s", self.etl.table.value, last_modified)
+        logger.info("Последнее изменение в таблице %s: %s", table, last_modified)
         return last_modified
 
     @backoff(ConnectionFailure)
     def extract(self):
-        """Извлекает данные о фильмах из Postgres."""
+        """
+        Извлекает данные из Postgres.
+        Отдаёт пачки вместе с ключом состояния и позицией (modified, id),
+        которую нужно сохранить после загрузки пачки. Позиция None означает,
+        что пачка не завершает страницу источника и состояние не сдвигается.
+        """
+        if self.etl.producers:
+            yield from self.extract_produced()
+            return
 
-        prev_mod = self.state.get_state(self.etl.index.value)
+        cursor = self.state.get_cursor(self.etl.index.value)
 
-        if last_modified := self.check_modified(prev_mod):
+        if self.check_modified(cursor):
             logger.info("Извлечение новых данных для %s", self.etl.index.value)
 
-            self.postgres_client.cursor.execute(self.query(prev_mod))
+            fetch = self.fetch_streaming if self.streaming else self.fetch
+            for data in fetch(self.query(cursor.modified, cursor.id)):
+                yield data, self.etl.index.value, Cursor.from_row(data[-1])
+
+    def extract_produced(self):
+        """
+        Извлекает документы, затронутые изменениями во всех источниках индекса.
+        Каждый источник отдаёт id изменённых документов, по ним собираются документы.
+        Повторы пропускаются только внутри одного источника: документ, собранный по другому источнику,
+        мог измениться после сборки, и позиция этого источника прошла бы мимо изменения.
+        """
+        for producer in self.etl.producers:
+            state_key = self.etl.state_key(producer.table)
+            loaded = set()
+
+            for page in self.produce(producer, self.state.get_cursor(state_key)):
+                ids = [doc_id for row in page for doc_id in row["doc_ids"] if doc_id not in loaded]
+                ids = list(dict.fromkeys(ids))
+                loaded.update(ids)
+
+                chunks = self.enrich(ids)
+                data = next(chunks, [])
+                for next_data in chunks:
+                    yield data, state_key, None
+                    data = next_data
+                yield data, state_key, Cursor.from_row(page[-1])
+
+    def fetch(self, query: SQL) -> Iterator[list[dict]]:
+        """Выполняет запрос клиентским курсором и отдаёт результат пачками."""
+        self.execute(self.postgres_client.cursor, query)
+
+        while data := self.fetchmany(self.postgres_client.cursor.fetchmany):
+            yield data
+
+    def fetch_streaming(self, query: SQL) -> Iterator[list[dict]]:
+        """
+        Выполняет запрос серверным курсором и отдаёт результат пачками.
+        Из Postgres строки читаются порциями по itersize, поэтому в памяти держатся
+        не больше itersize строк буфера курсора и текущая пачка, а первая пачка уходит сразу.
+        Транзакция завершается и при досрочной остановке, чтобы соединение можно было отдать другому индексу.
+        """
+        try:
+            with self.postgres_client.server_cursor(f"{self.etl.index.value}_extract") as cursor:
+                cursor.itersize = self.itersize
+                self.execute(cursor, query)
+
+                rows = iter(cursor)
+                while data := self.fetchmany(lambda size: list(islice(rows, size))):
+                    yield data
+        finally:
+            self.postgres_client.connection.commit()
+
+    def produce(self, producer: Producer, cursor: Cursor) -> Iterator[list[dict]]:
+        """Постранично выбирает изменённые записи источника после позиции cursor по ключу (modified, id)."""
+        logger.info("Извлечение изменений %s для %s с позиции %s", producer.table.value, self.etl.index.value, cursor)
+
+        while True:
+            page = self.fetchall(producer.query(cursor.modified, cursor.id, self.batch_size))
+
+            if not page:
+                break
+
+            yield page
+
+            cursor = Cursor.from_row(page[-1])
+
+    def enrich(self, ids: list[UUID]) -> Iterator[list[dict]]:
+        """Собирает документы по id пачками не больше batch_size, каждая пачка в своей транзакции."""
+        for start in range(0, len(ids), self.batch_size):
+            yield self.fetchall(self.query(ids[start : start + self.batch_size]))
+
+    def execute(self, cursor: PostgresCursor, query: SQL) -> None:
+        with tracer.span("execute", index=self.etl.index.value):
+            cursor.execute(query)
+
+    def fetchmany(self, fetch: Callable[[int], list[dict]]) -> list[dict]:
+        """Читает очередную пачку не больше batch_size строк."""
+        with tracer.span("fetchmany", index=self.etl.index.value):
+            return fetch(self.batch_size)
 
-            while data := self.postgres_client.cursor.fetchmany(size=self.batch_size):
-                yield data, str(last_modified)
+    def fetchall(self, query: SQL) -> list[dict]:
+        """Выполняет запрос и читает весь результат в отдельной транзакции."""
+        self.execute(self.postgres_client.cursor, query)
+        with tracer.span("fetchall", index=self.etl.index.value):
+            data = self.postgres_client.cursor.fetchall()
+        self.postgres_client.connection.commit()
+        return data
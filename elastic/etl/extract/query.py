@@ -1,7 +1,8 @@
 import logging
 from logging import config as logging_config
+from uuid import UUID
 
-from psycopg.sql import SQL, Identifier
+from psycopg.sql import SQL, Identifier, Literal
 from utils.logger import LOGGING_CONFIG
 
 logger = logging.getLogger(__name__)
@@ -12,7 +13,82 @@ class Query:
     """Класс SQL-запросов."""
 
     @staticmethod
-    def get_films_query(modified_time: str) -> SQL:
+    def get_changed_films_ids_query(after_modified: str, after_id: str, limit: int) -> SQL:
+        return SQL(
+            """
+            SELECT
+                fw.id,
+                fw.modified,
+                ARRAY[fw.id] AS doc_ids
+            FROM content.film_work fw
+            WHERE (fw.modified, fw.id) > ({after_modified}, {after_id})
+            ORDER BY fw.modified, fw.id
+            LIMIT {limit}
+            """
+        ).format(
+            after_modified=after_modified,
+            after_id=after_id,
+            limit=Literal(limit),
+        )
+
+    @staticmethod
+    def get_films_ids_by_persons_query(after_modified: str, after_id: str, limit: int) -> SQL:
+        return SQL(
+            """
+            WITH changed AS (
+                SELECT
+                    p.id,
+                    p.modified
+                FROM content.person p
+                WHERE (p.modified, p.id) > ({after_modified}, {after_id})
+                ORDER BY p.modified, p.id
+                LIMIT {limit}
+            )
+            SELECT
+                changed.id,
+                changed.modified,
+                COALESCE(array_agg(DISTINCT pfw.film_work_id) FILTER (WHERE pfw.film_work_id IS NOT NULL), ARRAY[]::uuid[]) AS doc_ids
+            FROM changed
+            LEFT JOIN content.person_film_work pfw ON pfw.person_id = changed.id
+            GROUP BY changed.id, changed.modified
+            ORDER BY changed.modified, changed.id
+            """
+        ).format(
+            after_modified=after_modified,
+            after_id=after_id,
+            limit=Literal(limit),
+        )
+
+    @staticmethod
+    def get_films_ids_by_genres_query(after_modified: str, after_id: str, limit: int) -> SQL:
+        return SQL(
+            """
+            WITH changed AS (
+                SELECT
+                    g.id,
+                    g.modified
+                FROM content.genre g
+                WHERE (g.modified, g.id) > ({after_modified}, {after_id})
+                ORDER BY g.modified, g.id
+                LIMIT {limit}
+            )
+            SELECT
+                changed.id,
+                changed.modified,
+                COALESCE(array_agg(DISTINCT gfw.film_work_id) FILTER (WHERE gfw.film_work_id IS NOT NULL), ARRAY[]::uuid[]) AS doc_ids
+            FROM changed
+            LEFT JOIN content.genre_film_work gfw ON gfw.genre_id = changed.id
+            GROUP BY changed.id, changed.modified
+            ORDER BY changed.modified, changed.id
+            """
+        ).format(
+            after_modified=after_modified,
+            after_id=after_id,
+            limit=Literal(limit),
+        )
+
+    @staticmethod
+    def get_films_by_ids_query(film_ids: list[UUID]) -> SQL:
         return SQL(
             """
             SELECT
@@ -59,50 +135,61 @@ class Query:
                 COALESCE(array_agg(DISTINCT p.full_name) FILTER (WHERE pfw.role = 'actor'), ARRAY[]::text[]) AS actors_names,
                 COALESCE(array_agg(DISTINCT p.full_name) FILTER (WHERE pfw.role = 'director'), ARRAY[]::text[]) AS directors_names,
                 COALESCE(array_agg(DISTINCT p.full_name) FILTER (WHERE pfw.role = 'writer'), ARRAY[]::text[]) AS writers_names,
-                MAX(fw.modified) AS modified -- Добавляем MAX(fw.modified), чтобы корректно агрегировать
+                fw.modified AS modified
             FROM content.film_work fw
             LEFT JOIN content.person_film_work pfw ON pfw.film_work_id = fw.id
             LEFT JOIN content.person p ON p.id = pfw.person_id
             LEFT JOIN content.genre_film_work gfw ON gfw.film_work_id = fw.id
             LEFT JOIN content.genre g ON g.id = gfw.genre_id
-            WHERE fw.modified > {last_modified}
-                OR p.modified > {last_modified}
-                OR g.modified > {last_modified}
-            GROUP BY fw.id, fw.title, fw.description, fw.rating
-            ORDER BY MAX(fw.modified)
+            WHERE fw.id = ANY({film_ids})
+            GROUP BY fw.id, fw.title, fw.description, fw.rating, fw.modified
+            ORDER BY fw.modified, fw.id
             """
-        ).format(last_modified=modified_time)
+        ).format(film_ids=Literal(film_ids))
 
+    @staticmethod
+    def get_ids_in_range_query(table: str, after_id: UUID | None, lower_id: UUID, upper_id: UUID, limit: int) -> SQL:
+        start = SQL("id > {after_id}").format(after_id=after_id) if after_id else SQL("id >= {lower_id}").format(lower_id=lower_id)
+        return SQL(
+            """
+            SELECT id
+            FROM {table}
+            WHERE {start} AND id <= {upper_id}
+            ORDER BY id
+            LIMIT {limit}
+            """
+        ).format(table=Identifier("content", table), start=start, upper_id=upper_id, limit=Literal(limit))
 
     @staticmethod
-    def check_modified(table, modified_time):
+    def check_modified(table, modified_time, after_id):
         logger.info("Проверка последнего изменения для таблицы: %s с last_mod: %s", table, modified_time)
 
         query = SQL(
             """
                 SELECT MAX(modified) AS last_modified
                 FROM {table}
-                WHERE modified > {last_modified}
+                WHERE (modified, id) > ({last_modified}, {after_id})
                 """
-        ).format(table=Identifier("content", table), last_modified=modified_time)
+        ).format(table=Identifier("content", table), last_modified=modified_time, after_id=after_id)
 
         return query
 
     @staticmethod
-    def get_genres_query(modified_time):
+    def get_genres_query(modified_time, after_id):
         return SQL(
             """
             SELECT
                 g.id,
-                g.name
+                g.name,
+                g.modified
             FROM content.genre AS g
-            WHERE g.modified > {last_modified}
-            ORDER BY g.modified;
+            WHERE (g.modified, g.id) > ({last_modified}, {after_id})
+            ORDER BY g.modified, g.id
             """
-        ).format(last_modified=modified_time)
+        ).format(last_modified=modified_time, after_id=after_id)
 
     @staticmethod
-    def get_persons_query(modified_time):
+    def get_persons_query(modified_time, after_id):
         return SQL(
              """
             WITH person_roles AS (SELECT pfw.person_id,
@@ -117,6 +204,7 @@ class Query:
                                   GROUP BY pfw.person_id, pfw.film_work_id)
             SELECT p.id,
                    p.full_name,
+                   p.modified,
                    COALESCE(
                                    jsonb_agg(
                                    jsonb_build_object(
@@ -128,8 +216,8 @@ class Query:
                        ) AS films
             FROM content.person AS p
                      LEFT JOIN person_roles ON person_roles.person_id = p.id
-            WHERE p.modified > {last_modified}
-            GROUP BY p.id, p.full_name
-            ORDER BY MAX(p.modified);
+            WHERE (p.modified, p.id) > ({last_modified}, {after_id})
+            GROUP BY p.id, p.full_name, p.modified
+            ORDER BY p.modified, p.id
             """
-        ).format(last_modified=modified_time)
+        ).format(last_modified=modified_time, after_id=after_id)
@@ -0,0 +1,76 @@
+import logging
+from dataclasses import dataclass
+from logging import config as logging_config
+from typing import Iterator
+from uuid import UUID
+
+from config.postgres import PostgresClient
+from etl.extract.query import Query
+from models.etl import ETL
+from state.state import Cursor, State
+from utils.logger import LOGGING_CONFIG
+
+logger = logging.getLogger(__name__)
+logging_config.dictConfig(LOGGING_CONFIG)
+
+UUID_SPACE = 2**128
+
+
+@dataclass(frozen=True)
+class Shard:
+    """Часть number из count равных диапазонов значений UUID первичного ключа."""
+
+    index: str
+    number: int
+    count: int
+
+    @property
+    def lower(self) -> UUID:
+        return UUID(int=self.number * UUID_SPACE // self.count)
+
+    @property
+    def upper(self) -> UUID:
+        return UUID(int=(self.number + 1) * UUID_SPACE // self.count - 1)
+
+    @property
+    def state_key(self) -> str:
+        """Ключ состояния с последним загруженным id диапазона."""
+        return f"{self.index}:shard:{self.number}"
+
+
+@dataclass
+class ShardExtractor:
+    """
+    Извлечение всех документов индекса из одного диапазона id таблицы etl.table.
+    Id выбираются страницами по первичному ключу, документы собираются запросом etl.query по id.
+    Позиция — последний загруженный id, так что прерванная загрузка диапазона продолжается с него.
+    """
+
+    postgres_client: PostgresClient
+    state: State
+    etl: ETL
+    shard: Shard
+    batch_size: int
+
+    def extract(self) -> Iterator[tuple[list[dict], str, Cursor]]:
+        cursor = self.state.get_cursor(self.shard.state_key)
+        after_id = UUID(cursor.id) if cursor else None
+        logger.info("Извлечение диапазона %s/%s для %s", self.shard.number + 1, self.shard.count, self.etl.index.value)
+
+        while True:
+            self.postgres_client.cursor.execute(
+                Query.get_ids_in_range_query(
+                    self.etl.table.value, after_id, self.shard.lower, self.shard.upper, self.batch_size
+                )
+            )
+            ids = [row["id"] for row in self.postgres_client.cursor.fetchall()]
+            if not ids:
+                self.postgres_client.connection.commit()
+                return
+
+            self.postgres_client.cursor.execute(self.etl.query(ids))
+            data = self.postgres_client.cursor.fetchall()
+            self.postgres_client.connection.commit()
+
+            after_id = ids[-1]
+            yield data, self.shard.state_key, Cursor(id=str(after_id))
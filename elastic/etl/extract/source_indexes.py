@@ -0,0 +1,51 @@
+import logging
+from logging import config as logging_config
+
+import psycopg
+from psycopg.sql import SQL, Identifier
+from pydantic import PostgresDsn
+from utils.logger import LOGGING_CONFIG
+
+logger = logging.getLogger(__name__)
+logging_config.dictConfig(LOGGING_CONFIG)
+
+LOCK_KEY = "content.etl_source_indexes"
+
+# Имя индекса, таблица схемы content и столбцы.
+# (modified, id) — постраничное чтение изменений по ключу в запросах Query.
+SOURCE_INDEXES = [
+    ("film_work_modified_id_idx", "film_work", ("modified", "id")),
+    ("person_modified_id_idx", "person", ("modified", "id")),
+    ("genre_modified_id_idx", "genre", ("modified", "id")),
+    # Фильмы изменённых персон и жанров: уникальные индексы связей начинаются с film_work_id.
+    ("person_film_work_person_idx", "person_film_work", ("person_id",)),
+    ("genre_film_work_genre_idx", "genre_film_work", ("genre_id",)),
+]
+
+CREATE_INDEX = SQL("CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})")
+
+
+def ensure_source_indexes(dsn: PostgresDsn) -> bool:
+    """
+    Создаёт индексы Postgres, на которые рассчитаны запросы извлечения, если их ещё нет.
+    Индексы строятся CONCURRENTLY, не блокируя запись в таблицы, и по одному процессу ETL
+    за раз. Если создать индексы не удалось, ETL продолжает работу без них.
+    """
+    try:
+        with psycopg.connect(str(dsn), autocommit=True) as connection:
+            # Блокировка сеанса снимается при закрытии соединения.
+            connection.execute("SELECT pg_advisory_lock(hashtext(%s))", (LOCK_KEY,))
+            for name, table, columns in SOURCE_INDEXES:
+                connection.execute(
+                    CREATE_INDEX.format(
+                        name=Identifier(name),
+                        table=Identifier("content", table),
+                        columns=SQL(", ").join(map(Identifier, columns)),
+                    )
+                )
+    except psycopg.Error as error:
+        logger.warning("Индексы для извлечения изменений не созданы: %s", error)
+        return False
+
+    logger.info("Индексы для извлечения изменений: %s", ", ".join(name for name, _, _ in SOURCE_INDEXES))
+    return True
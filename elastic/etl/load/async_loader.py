@@ -0,0 +1,201 @@
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from logging import config as logging_config
+from typing import Any, Dict, List
+
+from config.elasticsearch import AsyncElasticsearchClient
+from elasticsearch.exceptions import ConnectionError, NotFoundError
+from elasticsearch.helpers import async_streaming_bulk
+from etl.load.data_loader import BaseElasticsearchLoader, BulkFailure
+from state.base_storage import AsyncBaseHashStorage
+from state.state import AsyncState, Cursor
+from utils.backoff import async_backoff
+from utils.logger import LOGGING_CONFIG
+from utils.metrics import observe_lag
+
+logger = logging.getLogger(__name__)
+logging_config.dictConfig(LOGGING_CONFIG)
+
+
+@dataclass
+class AsyncElasticsearchLoader(BaseElasticsearchLoader):
+    """
+    Асинхронный вариант ElasticsearchLoader на AsyncElasticsearch.
+    При thread_count > 1 запросы bulk одной пачки отправляются конкурентно в цикле событий, без потоков.
+    """
+
+    client: AsyncElasticsearchClient
+    state: AsyncState
+    hashes: AsyncBaseHashStorage | None = None
+
+    @async_backoff(ConnectionError)
+    async def bulk_load(self, batch: List[Dict], state_key: str, cursor: Cursor | None) -> List[BulkFailure]:
+        """Метод для выполнения массовой загрузки. Возвращает документы, которые не удалось загрузить."""
+
+        failures = []
+
+        if batch:
+            actions, digests = self.prepare(batch)
+            actions = await self.skip_unchanged(actions, digests)
+
+            logger.info("Началась массовая загрузка для индекса: %s", self.write_index)
+            loaded = {}
+            started = time.perf_counter()
+            for ok, item in await self._bulk(actions) if actions else ():
+                _, info = item.popitem()
+                if ok:
+                    loaded[info["_id"]] = digests[info["_id"]]
+                else:
+                    failures.append(self.failure(info))
+
+            self.observe(batch, actions, failures, time.perf_counter() - started)
+
+            if self.hashes and loaded:
+                await self.hashes.save_hashes(self.hashes_key, loaded)
+
+            logger.info(
+                "Массовая загрузка для индекса %s завершена: %s документов, без изменений: %s, ошибок: %s",
+                self.write_index,
+                len(actions),
+                len(batch) - len(actions),
+                len(failures),
+            )
+        if cursor:
+            await self.state.set_cursor(state_key, cursor)
+            observe_lag(self.index, state_key, cursor.modified)
+            logger.info("Состояние %s обновлено на: %s", state_key, cursor)
+
+        return failures
+
+    async def skip_unchanged(self, actions: List[Dict], digests: Dict[str, str]) -> List[Dict]:
+        """Убирает действия для документов, хеш которых совпадает с сохранённым (кроме полной загрузки)."""
+        if not self.hashes or self._write_index:
+            return actions
+
+        unchanged = self.unchanged(digests, await self.hashes.get_hashes(self.hashes_key, list(digests)))
+        return [action for action in actions if action["_id"] not in unchanged]
+
+    async def _bulk(self, actions: List[Dict]) -> List[tuple[bool, Dict]]:
+        """Результат загрузки по каждому документу: (успех, ответ Elasticsearch)."""
+        options = dict(
+            client=self.client.connection,
+            index=self.write_index,
+            chunk_size=self.chunk_size,
+            max_chunk_bytes=self.max_chunk_bytes,
+            raise_on_error=False,
+        )
+        if self.thread_count <= 1:
+            return [result async for result in async_streaming_bulk(actions=actions, **options)]
+
+        semaphore = asyncio.Semaphore(self.thread_count)
+
+        async def send(chunk: List[Dict]) -> List[tuple[bool, Dict]]:
+            async with semaphore:
+                return [result async for result in async_streaming_bulk(actions=chunk, **options)]
+
+        chunks = [actions[start : start + self.chunk_size] for start in range(0, len(actions), self.chunk_size)]
+        return [result for results in await asyncio.gather(*map(send, chunks)) for result in results]
+
+    async def reindex_in_progress(self) -> bool:
+        """Полная загрузка начата и ещё не завершена."""
+        return bool(await self.state.get_state(self.reindex_state_key))
+
+    async def sharded_reindex_in_progress(self) -> bool:
+        """Идёт загрузка по диапазонам, см. ElasticsearchLoader.sharded_reindex_in_progress."""
+        return bool(await self.state.get_state(self.sharded_reindex_state_key))
+
+    @async_backoff(ConnectionError)
+    async def index_exists(self) -> bool:
+        """Существует ли индекс или алиас, из которого читает API."""
+        return bool(await self.client.connection.indices.exists(index=self.index))
+
+    @async_backoff(ConnectionError)
+    async def index_outdated(self) -> bool:
+        """Индекса нет или он создан из другого тела индекса, см. ElasticsearchLoader.index_outdated."""
+        try:
+            return self.outdated(await self.client.connection.indices.get_mapping(index=self.index))
+        except NotFoundError:
+            return True
+
+    @async_backoff(ConnectionError)
+    async def index_empty(self) -> bool:
+        """В индексе, из которого читает API, нет документов."""
+        return (await self.client.connection.count(index=self.index))["count"] == 0
+
+    async def begin_reindex(self, state_keys: list[str]) -> None:
+        """Начинает или продолжает полную загрузку в новую версию индекса, см. ElasticsearchLoader.begin_reindex."""
+        if saved := await self.state.get_state(self.reindex_state_key):
+            reindex = json.loads(saved)
+        else:
+            reindex = await self.create_version()
+            await self.state.set_states(
+                {state_key: Cursor().dumps() for state_key in state_keys}
+                | {self.reindex_state_key: json.dumps(reindex)}
+            )
+            if self.hashes:
+                await self.hashes.clear(self.hashes_key)
+
+        self.use_version(reindex["index"])
+        logger.info("Полная загрузка индекса %s в версию %s", self.index, self._write_index)
+
+    async def finish_reindex(self) -> None:
+        """Завершает полную загрузку и переключает алиас, см. ElasticsearchLoader.finish_reindex."""
+        reindex = json.loads(await self.state.get_state(self.reindex_state_key))
+        self.use_version(None)
+
+        await self.put_settings(reindex["index"], reindex["settings"])
+        await self.client.connection.indices.refresh(index=reindex["index"])
+        await self.verify_version(reindex["index"])
+        await self.switch_alias(reindex["index"])
+        await self.state.set_state(self.reindex_state_key, "")
+        logger.info("Алиас %s переключён на версию %s", self.index, reindex["index"])
+
+    @async_backoff(ConnectionError)
+    async def create_version(self) -> Dict[str, Any]:
+        """Создаёт следующую версию индекса с отключёнными refresh и репликами."""
+        versions = await self.client.connection.indices.get(index=f"{self.index}_v*", allow_no_indices=True)
+        name, body, settings = self.new_version(versions)
+
+        await self.client.connection.indices.create(index=name, **body)
+        return {"index": name, "settings": settings}
+
+    @async_backoff(ConnectionError)
+    async def other_versions(self, name: str) -> list[str]:
+        """Версии индекса, кроме name, см. ElasticsearchLoader.other_versions."""
+        versions = await self.client.connection.indices.get(index=f"{self.index}_v*", allow_no_indices=True)
+        return [version for version in versions if version != name]
+
+    @async_backoff(ConnectionError)
+    async def verify_version(self, name: str) -> None:
+        """Проверяет, что новая версия не меньше текущей, см. ElasticsearchLoader.verify_version."""
+        new_count = (await self.client.connection.count(index=name))["count"]
+        live = [self.index] if await self.index_exists() else await self.other_versions(name)
+        live_count = max([(await self.client.connection.count(index=index))["count"] for index in live], default=0)
+        self.check_version(name, new_count, live_count)
+
+    @async_backoff(ConnectionError)
+    async def switch_alias(self, name: str) -> None:
+        """Атомарно переводит алиас на новую версию и удаляет прежние версии, см. ElasticsearchLoader.switch_alias."""
+        indices = self.client.connection.indices
+        actions = [{"add": {"index": name, "alias": self.index}}]
+
+        if await indices.exists_alias(name=self.index):
+            previous = [index for index in await indices.get_alias(name=self.index) if index != name]
+            actions += [{"remove": {"index": index, "alias": self.index}} for index in previous]
+        else:
+            if await indices.exists(index=self.index):
+                actions.append({"remove_index": {"index": self.index}})
+            previous = await self.other_versions(name)
+
+        await indices.update_aliases(actions=actions)
+
+        for index in previous:
+            await indices.delete(index=index)
+
+    @async_backoff(ConnectionError)
+    async def put_settings(self, name: str, settings: Dict[str, Any]) -> None:
+        """Обновляет динамические настройки индекса."""
+        await self.client.connection.indices.put_settings(index=name, settings=settings)
@@ -1,39 +1,344 @@
+import copy
+import hashlib
+import json
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from logging import config as logging_config
-from typing import Dict, List
+from typing import Any, Dict, Iterable, List
 
+import orjson
 from config.elasticsearch import ElasticsearchClient
-from elasticsearch.exceptions import ConnectionError
-from elasticsearch.helpers import bulk
-from state.state import State
+from elasticsearch.exceptions import ConnectionError, NotFoundError
+from elasticsearch.helpers import parallel_bulk, streaming_bulk
+from state.base_storage import BaseHashStorage
+from state.state import Cursor, State
 from utils.backoff import backoff
 from utils.logger import LOGGING_CONFIG
+from utils.metrics import (
+    BULK_BYTES,
+    BULK_SECONDS,
+    DOCUMENTS_FAILED,
+    DOCUMENTS_LOADED,
+    DOCUMENTS_SKIPPED,
+    observe_lag,
+)
 
 logger = logging.getLogger(__name__)
 logging_config.dictConfig(LOGGING_CONFIG)
 
+REINDEX_SETTINGS = {"refresh_interval": "-1", "number_of_replicas": 0}
+
 
 @dataclass
-class ElasticsearchLoader:
-    """Класс для загрузки данных в Elasticsearch."""
+class BulkFailure:
+    """Документ, который Elasticsearch не принял при массовой загрузке."""
 
-    client: ElasticsearchClient
-    state: State
+    id: str | None
+    status: int | None
+    error: Any
+
+
+@dataclass
+class BaseElasticsearchLoader:
+    """
+    Общая часть синхронного и асинхронного загрузчика: подготовка действий bulk,
+    ключи состояния и описание новой версии индекса. Запросы к Elasticsearch выполняют наследники.
+    """
+
+    client: Any
+    state: Any
     index: str
     batch_size: int
+    thread_count: int = 1
+    chunk_size: int = 500
+    max_chunk_bytes: int = 100 * 1024 * 1024
+    index_body: Dict[str, Any] = field(default_factory=dict)
+    hashes: Any = None
+    _write_index: str | None = field(default=None, init=False, repr=False)
+
+    @staticmethod
+    def to_action(document: Dict) -> Dict:
+        """Явное действие index с _id сущности и телом документа в JSON."""
+        if "_source" in document:
+            return {"_op_type": "index", **document}
+
+        source = {key: value for key, value in document.items() if key != "_id"}
+        return {"_op_type": "index", "_id": str(document.get("_id", document["id"])), "_source": orjson.dumps(source)}
+
+    def prepare(self, batch: List[Dict]) -> tuple[List[Dict], Dict[str, str]]:
+        """Действия bulk для пачки и хеши тел документов по _id."""
+        actions = [self.to_action(document) for document in batch]
+        digests = {
+            action["_id"]: hashlib.blake2b(action["_source"], digest_size=16).hexdigest() for action in actions
+        }
+        return actions, digests
+
+    @staticmethod
+    def unchanged(digests: Dict[str, str], stored: List[str | None]) -> set[str]:
+        """_id документов, хеш которых совпадает с сохранённым."""
+        return {doc_id for doc_id, digest in zip(digests, stored) if digest == digests[doc_id]}
+
+    @staticmethod
+    def failure(info: Dict) -> BulkFailure:
+        """Описание документа по ответу Elasticsearch с ошибкой."""
+        return BulkFailure(id=info.get("_id"), status=info.get("status"), error=info.get("error"))
+
+    def observe(self, batch: List[Dict], actions: List[Dict], failures: List[BulkFailure], seconds: float) -> None:
+        """Обновляет метрики загрузки по итогам пачки."""
+        BULK_SECONDS.labels(self.index).observe(seconds)
+        BULK_BYTES.labels(self.index).inc(sum(len(action["_source"]) for action in actions))
+        DOCUMENTS_LOADED.labels(self.index).inc(len(actions) - len(failures))
+        DOCUMENTS_SKIPPED.labels(self.index).inc(len(batch) - len(actions))
+        DOCUMENTS_FAILED.labels(self.index).inc(len(failures))
+
+    @property
+    def body_hash(self) -> str:
+        """Хеш тела индекса из indexes_path, сохраняется в _meta маппинга каждой версии."""
+        return hashlib.blake2b(json.dumps(self.index_body, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+    def outdated(self, mappings: Dict[str, Any]) -> bool:
+        """Хотя бы одна версия в ответе get_mapping создана из другого тела индекса."""
+        return any(
+            mapping["mappings"].get("_meta", {}).get("body_hash") != self.body_hash for mapping in mappings.values()
+        )
+
+    @property
+    def hashes_key(self) -> str:
+        """Ключ хранилища хешей документов индекса."""
+        return f"{self.index}:hashes"
+
+    @property
+    def reindex_state_key(self) -> str:
+        """Ключ состояния с описанием незавершённой полной загрузки."""
+        return f"{self.index}:reindex"
+
+    @property
+    def sharded_reindex_state_key(self) -> str:
+        """Ключ состояния с описанием незавершённой загрузки по диапазонам, см. etl.reindex.ShardedReindex."""
+        return f"{self.index}:sharded_reindex"
+
+    @property
+    def write_index(self) -> str:
+        """Индекс для записи: новая версия во время полной загрузки, иначе алиас."""
+        return self._write_index or self.index
+
+    def use_version(self, name: str | None) -> None:
+        """Направляет запись в версию индекса name, None — обратно в алиас."""
+        self._write_index = name
+
+    def new_version(self, versions: Iterable[str]) -> tuple[str, Dict[str, Any], Dict[str, Any]]:
+        """
+        Имя следующей версии индекса по уже существующим, тело для её создания
+        с отключёнными refresh и репликами и исходные значения этих настроек.
+        """
+        number = max((int(name.rsplit("_v", 1)[1]) for name in versions), default=0) + 1
+
+        body = copy.deepcopy(self.index_body)
+        body.setdefault("mappings", {})["_meta"] = {"body_hash": self.body_hash}
+        index_settings = body.setdefault("settings", {})
+        settings = {key: index_settings.get(key) for key in REINDEX_SETTINGS}
+        index_settings.update(REINDEX_SETTINGS)
+
+        return f"{self.index}_v{number}", body, settings
+
+    def check_version(self, name: str, new_count: int, live_count: int) -> None:
+        """Новая версия не должна быть меньше текущей: ETL не удаляет документы."""
+        if new_count < live_count:
+            raise RuntimeError(
+                f"Версия {name} содержит {new_count} документов, а {self.index} — {live_count}; алиас не переключён"
+            )
+
+
+@dataclass
+class ElasticsearchLoader(BaseElasticsearchLoader):
+    """
+    Класс для загрузки данных в Elasticsearch.
+    Документы отправляются явными действиями index с _id сущности. Пачка делится на запросы bulk
+    не больше chunk_size документов и max_chunk_bytes байт, при thread_count > 1 запросы отправляются параллельно.
+    Если задано хранилище hashes, документы, тело которых не изменилось с прошлой загрузки, не отправляются.
+    """
+
+    client: ElasticsearchClient
+    state: State
+    hashes: BaseHashStorage | None = None
 
     @backoff(ConnectionError)
-    def bulk_load(self, batch: List[Dict], last_mod: str) -> None:
-        """Метод для выполнения массовой загрузки."""
+    def bulk_load(self, batch: List[Dict], state_key: str, cursor: Cursor | None) -> List[BulkFailure]:
+        """Метод для выполнения массовой загрузки. Возвращает документы, которые не удалось загрузить."""
+
+        failures = []
+
+        if batch:
+            actions, digests = self.prepare(batch)
+            actions = self.skip_unchanged(actions, digests)
 
-        logger.info("Началась массовая загрузка для индекса: %s", self.index)
-        bulk(
+            logger.info("Началась массовая загрузка для индекса: %s", self.write_index)
+            loaded = {}
+            started = time.perf_counter()
+            for ok, item in self._bulk(actions) if actions else ():
+                _, info = item.popitem()
+                if ok:
+                    loaded[info["_id"]] = digests[info["_id"]]
+                else:
+                    failures.append(self.failure(info))
+
+            self.observe(batch, actions, failures, time.perf_counter() - started)
+
+            if self.hashes and loaded:
+                self.hashes.save_hashes(self.hashes_key, loaded)
+
+            logger.info(
+                "Массовая загрузка для индекса %s завершена: %s документов, без изменений: %s, ошибок: %s",
+                self.write_index,
+                len(actions),
+                len(batch) - len(actions),
+                len(failures),
+            )
+        if cursor:
+            self.state.set_cursor(state_key, cursor)
+            observe_lag(self.index, state_key, cursor.modified)
+            logger.info("Состояние %s обновлено на: %s", state_key, cursor)
+
+        return failures
+
+    def skip_unchanged(self, actions: List[Dict], digests: Dict[str, str]) -> List[Dict]:
+        """
+        Убирает действия для документов, хеш которых совпадает с сохранённым.
+        Во время полной загрузки новая версия индекса пуста, поэтому отправляются все документы.
+        """
+        if not self.hashes or self._write_index:
+            return actions
+
+        unchanged = self.unchanged(digests, self.hashes.get_hashes(self.hashes_key, list(digests)))
+        return [action for action in actions if action["_id"] not in unchanged]
+
+    def _bulk(self, batch: List[Dict]):
+        """Результат загрузки по каждому документу: (успех, ответ Elasticsearch)."""
+        options = dict(
             client=self.client.connection,
             actions=batch,
-            index=self.index,
-            chunk_size=self.batch_size,
+            index=self.write_index,
+            chunk_size=self.chunk_size,
+            max_chunk_bytes=self.max_chunk_bytes,
+            raise_on_error=False,
         )
-        logger.info("Массовая загрузка для индекса %s завершена успешно", self.index)
-        self.state.set_state(self.index, last_mod)
-        logger.info("Состояние индекса %s обновлено на: %s", self.index, last_mod)
+        if self.thread_count > 1:
+            return parallel_bulk(thread_count=self.thread_count, queue_size=self.thread_count, **options)
+        return streaming_bulk(**options)
+
+    def reindex_in_progress(self) -> bool:
+        """Полная загрузка начата и ещё не завершена, например, прервана падением процесса."""
+        return bool(self.state.get_state(self.reindex_state_key))
+
+    def sharded_reindex_in_progress(self) -> bool:
+        """Идёт загрузка по диапазонам: позиции и алиас индекса переключит она."""
+        return bool(self.state.get_state(self.sharded_reindex_state_key))
+
+    @backoff(ConnectionError)
+    def index_exists(self) -> bool:
+        """Существует ли индекс или алиас, из которого читает API."""
+        return bool(self.client.connection.indices.exists(index=self.index))
+
+    @backoff(ConnectionError)
+    def index_outdated(self) -> bool:
+        """
+        Индекса нет или он создан из другого тела индекса, например, до изменения маппинга:
+        документы нужно загрузить в новую версию.
+        """
+        try:
+            return self.outdated(self.client.connection.indices.get_mapping(index=self.index))
+        except NotFoundError:
+            return True
+
+    @backoff(ConnectionError)
+    def index_empty(self) -> bool:
+        """В индексе, из которого читает API, нет документов."""
+        return self.client.connection.count(index=self.index)["count"] == 0
+
+    def begin_reindex(self, state_keys: list[str]) -> None:
+        """
+        Начинает или продолжает полную загрузку в новую версию индекса (index_v<N>).
+        Пока идёт загрузка, API читает прежнюю версию через алиас, а у новой отключены refresh и реплики.
+        Описание загрузки хранится в состоянии, поэтому загрузку можно вести частями
+        и продолжить в ту же версию после падения процесса. Позиции state_keys новой загрузки
+        сбрасываются на начало вместе с созданием версии.
+        """
+        if saved := self.state.get_state(self.reindex_state_key):
+            reindex = json.loads(saved)
+        else:
+            reindex = self.create_version()
+            self.state.set_states(
+                {state_key: Cursor().dumps() for state_key in state_keys}
+                | {self.reindex_state_key: json.dumps(reindex)}
+            )
+            if self.hashes:
+                self.hashes.clear(self.hashes_key)
+
+        self.use_version(reindex["index"])
+        logger.info("Полная загрузка индекса %s в версию %s", self.index, self._write_index)
+
+    def finish_reindex(self) -> None:
+        """
+        Завершает полную загрузку: восстанавливает настройки новой версии, проверяет её,
+        атомарно переключает на неё алиас и удаляет прежние версии.
+        """
+        reindex = json.loads(self.state.get_state(self.reindex_state_key))
+        self.use_version(None)
+
+        self.put_settings(reindex["index"], reindex["settings"])
+        self.client.connection.indices.refresh(index=reindex["index"])
+        self.verify_version(reindex["index"])
+        self.switch_alias(reindex["index"])
+        self.state.set_state(self.reindex_state_key, "")
+        logger.info("Алиас %s переключён на версию %s", self.index, reindex["index"])
+
+    @backoff(ConnectionError)
+    def create_version(self) -> Dict[str, Any]:
+        """Создаёт следующую версию индекса с отключёнными refresh и репликами."""
+        versions = self.client.connection.indices.get(index=f"{self.index}_v*", allow_no_indices=True)
+        name, body, settings = self.new_version(versions)
+
+        self.client.connection.indices.create(index=name, **body)
+        return {"index": name, "settings": settings}
+
+    @backoff(ConnectionError)
+    def other_versions(self, name: str) -> list[str]:
+        """Версии индекса, кроме name, в том числе оставшиеся без алиаса."""
+        versions = self.client.connection.indices.get(index=f"{self.index}_v*", allow_no_indices=True)
+        return [version for version in versions if version != name]
+
+    @backoff(ConnectionError)
+    def verify_version(self, name: str) -> None:
+        """
+        Проверяет, что новая версия не меньше текущей: ETL не удаляет документы.
+        Если алиаса нет, новая версия сравнивается с самой большой из оставшихся версий.
+        """
+        new_count = self.client.connection.count(index=name)["count"]
+        live = [self.index] if self.index_exists() else self.other_versions(name)
+        live_count = max((self.client.connection.count(index=index)["count"] for index in live), default=0)
+        self.check_version(name, new_count, live_count)
+
+    @backoff(ConnectionError)
+    def switch_alias(self, name: str) -> None:
+        """Атомарно переводит алиас на новую версию и удаляет прежние версии, в том числе оставшиеся без алиаса."""
+        indices = self.client.connection.indices
+        actions = [{"add": {"index": name, "alias": self.index}}]
+
+        if indices.exists_alias(name=self.index):
+            previous = [index for index in indices.get_alias(name=self.index) if index != name]
+            actions += [{"remove": {"index": index, "alias": self.index}} for index in previous]
+        else:
+            if indices.exists(index=self.index):
+                actions.append({"remove_index": {"index": self.index}})
+            previous = self.other_versions(name)
+
+        indices.update_aliases(actions=actions)
+
+        for index in previous:
+            indices.delete(index=index)
+
+    @backoff(ConnectionError)
+    def put_settings(self, name: str, settings: Dict[str, Any]) -> None:
+        """Обновляет динамические настройки индекса."""
+        self.client.connection.indices.put_settings(index=name, settings=settings)
@@ -0,0 +1,150 @@
+import logging
+from collections import deque
+from contextlib import closing
+from contextvars import copy_context
+from dataclasses import dataclass
+from logging import config as logging_config
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from typing import Any, Callable, Iterator
+
+from etl.extract.data_extract import PostgresExtractor
+from etl.load.data_loader import ElasticsearchLoader
+from etl.transform.data_transform import DataTransform
+from utils.logger import LOGGING_CONFIG
+from utils.metrics import ROWS_EXTRACTED
+from utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+logging_config.dictConfig(LOGGING_CONFIG)
+
+DONE = object()
+POLL_TIMEOUT = 0.5
+
+
+@dataclass
+class Pipeline:
+    """
+    Конвейер extract → transform → load.
+    Этапы работают в отдельных потоках и связаны ограниченными очередями:
+    пока Elasticsearch индексирует пачку N, из Postgres уже читается пачка N+1.
+    Если очередь заполнена, предыдущий этап ждёт, так что в памяти не больше queue_size пачек на этап.
+    """
+
+    extractor: PostgresExtractor
+    transformer: DataTransform
+    loader: ElasticsearchLoader
+    queue_size: int = 4
+
+    def run(self, max_batches: int | None = None) -> bool:
+        """
+        Выполняет цикл ETL. Возвращает True, когда загружена последняя пачка.
+        С max_batches цикл прерывается после указанного числа пачек и возвращает False:
+        состояние сохранено после каждой пачки, следующий запуск продолжит с того же места.
+        """
+        stop = Event()
+        errors: list[BaseException] = []
+        extracted = Queue(maxsize=self.queue_size)
+        transformed = Queue(maxsize=self.queue_size)
+
+        stages = [
+            Thread(
+                target=copy_context().run,
+                args=(self._stage, self._extract, None, extracted, stop, errors),
+                name="extract",
+            ),
+            Thread(
+                target=copy_context().run,
+                args=(self._stage, self._transform, extracted, transformed, stop, errors),
+                name="transform",
+            ),
+        ]
+        for stage in stages:
+            stage.start()
+
+        finished = True
+        try:
+            for number, (data, state_key, cursor) in enumerate(self._drain(transformed, stop), start=1):
+                self.load(data, state_key, cursor)
+                if max_batches and number >= max_batches:
+                    finished = False
+                    break
+        finally:
+            stop.set()
+            for stage in stages:
+                stage.join()
+
+        if errors:
+            raise errors[0]
+        return finished
+
+    def load(self, data: list[dict], state_key: str, cursor: Any) -> None:
+        """Загружает пачку в Elasticsearch и сдвигает состояние."""
+        with tracer.span("bulk_load", index=self.loader.index, documents=len(data)), tracer.profile("load"):
+            failures = self.loader.bulk_load(data, state_key, cursor)
+        for failure in failures or []:
+            logger.error("Ошибка для документа ID=%s (%s): %s", failure.id, failure.status, failure.error)
+
+    def _extract(self, _: None) -> Iterator[tuple]:
+        with closing(self.extractor.extract()) as batches:
+            while True:
+                with tracer.profile("extract"):
+                    item = next(batches, None)
+                if item is None:
+                    return
+                ROWS_EXTRACTED.labels(self.loader.index).inc(len(item[0]))
+                yield item
+
+    def _transform(self, batches: Iterator[tuple]) -> Iterator[tuple]:
+        positions = deque()
+
+        def data() -> Iterator[list[dict]]:
+            for batch, state_key, cursor in batches:
+                positions.append((state_key, cursor))
+                yield batch
+
+        for transformed in self.transformer.transform_batches(data()):
+            yield transformed, *positions.popleft()
+
+    def _stage(
+        self,
+        work: Callable[[Iterator[tuple] | None], Iterator[tuple]],
+        source: Queue | None,
+        target: Queue,
+        stop: Event,
+        errors: list[BaseException],
+    ) -> None:
+        """Переносит результат этапа в следующую очередь, пока этап не закончится или конвейер не остановят."""
+        try:
+            for item in work(self._drain(source, stop) if source else None):
+                if not self._put(target, item, stop):
+                    return
+        except BaseException as error:
+            logger.error("Ошибка на этапе %s конвейера", work.__name__, exc_info=True)
+            errors.append(error)
+            stop.set()
+        finally:
+            self._put(target, DONE, stop)
+
+    @staticmethod
+    def _put(queue: Queue, item: Any, stop: Event) -> bool:
+        """Кладёт элемент в очередь, ожидая свободного места, пока конвейер не остановлен."""
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=POLL_TIMEOUT)
+                return True
+            except Full:
+                continue
+        return False
+
+    @staticmethod
+    def _drain(queue: Queue, stop: Event) -> Iterator[Any]:
+        """Читает элементы из очереди до маркера конца или остановки конвейера."""
+        while not stop.is_set():
+            try:
+                item = queue.get(timeout=POLL_TIMEOUT)
+            except Empty:
+                continue
+            if item is DONE:
+                return
+            yield item
@@ -0,0 +1,126 @@
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
+from itertools import repeat
+from logging import config as logging_config
+from multiprocessing import get_context
+
+from config import ElasticsearchClient, PostgresClient, RedisClient
+from config.settings import Settings
+from etl.etl import make_loader
+from etl.extract.shard_extract import Shard, ShardExtractor
+from etl.pipeline import Pipeline
+from etl.transform.data_transform import DataTransform
+from models.etl import ETL
+from state.redis_storage import RedisHashStorage, RedisStorage
+from state.state import Cursor, State
+from utils.logger import LOGGING_CONFIG
+
+logger = logging.getLogger(__name__)
+logging_config.dictConfig(LOGGING_CONFIG)
+
+
+def reindex_shard(etl: ETL, version: str, shard: Shard, settings: Settings) -> None:
+    """Загружает один диапазон id в версию индекса version. Выполняется в процессе-воркере."""
+    with closing(ElasticsearchClient(settings.elasticsearch_dsn)) as elasticsearch_client, closing(
+        PostgresClient(settings.postgres_dsn)
+    ) as postgres_client, closing(RedisClient(settings.redis_dsn)) as redis_client, closing(
+        DataTransform(
+            model=etl.model,
+            index=etl.index.value,
+            fast=settings.transform_fast,
+            validate_sample=settings.transform_validate_sample,
+        )
+    ) as transformer:
+        state = State(storage=RedisStorage(redis_client=redis_client), flush_every=settings.state_flush_every)
+
+        hashes = RedisHashStorage(redis_client=redis_client) if settings.document_hashes == "redis" else None
+        loader = make_loader(etl, settings, elasticsearch_client, state, hashes)
+        loader.use_version(version)
+
+        extractor = ShardExtractor(
+            postgres_client=postgres_client, state=state, etl=etl, shard=shard, batch_size=settings.batch_size
+        )
+        try:
+            Pipeline(
+                extractor=extractor, transformer=transformer, loader=loader, queue_size=settings.pipeline_queue_size
+            ).run()
+        finally:
+            state.flush()
+
+    logger.info("Диапазон %s/%s индекса %s загружен", shard.number + 1, shard.count, etl.index.value)
+
+
+@dataclass
+class ShardedReindex:
+    """
+    Полная загрузка индекса в новую версию несколькими процессами.
+    Таблица etl.table делится на shards равных диапазонов UUID первичного ключа, у каждого процесса
+    свой курсор Postgres, преобразование, загрузчик и позиция в состоянии. Повторный запуск после
+    падения продолжает ту же версию с сохранённых позиций.
+    После загрузки версия проверяется и алиас переключается, как в ElasticsearchLoader.finish_reindex,
+    а позиции инкрементального ETL переводятся на момент начала загрузки: изменения, сделанные
+    во время загрузки, будут загружены повторно. Пока описание загрузки сохранено в состоянии,
+    запущенный ETL этот индекс не обновляет и не сдвигает его позиции. Хеши документов
+    очищаются и после переключения, чтобы повторная загрузка изменений не была пропущена.
+    Поддерживаются индексы, документы которых собираются по id (с источниками изменений).
+    """
+
+    etl: ETL
+    settings: Settings
+    shards: int
+
+    def __post_init__(self):
+        if not self.etl.producers:
+            raise ValueError(f"Индекс {self.etl.index.value} не собирается по id, загрузка по диапазонам невозможна")
+
+    def run(self) -> None:
+        with closing(ElasticsearchClient(self.settings.elasticsearch_dsn)) as elasticsearch_client, closing(
+            PostgresClient(self.settings.postgres_dsn)
+        ) as postgres_client, closing(RedisClient(self.settings.redis_dsn)) as redis_client:
+            state = State(storage=RedisStorage(redis_client=redis_client))
+            hashes = RedisHashStorage(redis_client=redis_client) if self.settings.document_hashes == "redis" else None
+            loader = make_loader(self.etl, self.settings, elasticsearch_client, state, hashes)
+
+            if saved := state.get_state(loader.sharded_reindex_state_key):
+                reindex = json.loads(saved)
+                logger.info("Продолжение загрузки %s в версию %s", self.etl.index.value, reindex["index"])
+            else:
+                # modified в таблицах content — timestamp without time zone: позиция должна быть того же типа,
+                # иначе при сравнении смещение часового пояса отбрасывается.
+                postgres_client.cursor.execute("SELECT localtimestamp AS started")
+                started = postgres_client.cursor.fetchone()["started"]
+                postgres_client.connection.commit()
+
+                reindex = loader.create_version() | {"shards": self.shards, "started": str(started)}
+                state.set_states({shard.state_key: "" for shard in self.make_shards(reindex["shards"])})
+                if hashes:
+                    hashes.clear(loader.hashes_key)
+                state.set_state(loader.sharded_reindex_state_key, json.dumps(reindex))
+                logger.info("Загрузка %s по диапазонам в версию %s", self.etl.index.value, reindex["index"])
+
+            shards = self.make_shards(reindex["shards"])
+            with ProcessPoolExecutor(max_workers=len(shards), mp_context=get_context("spawn")) as pool:
+                results = pool.map(
+                    reindex_shard, repeat(self.etl), repeat(reindex["index"]), shards, repeat(self.settings)
+                )
+                for _ in results:
+                    pass
+
+            loader.put_settings(reindex["index"], reindex["settings"])
+            elasticsearch_client.connection.indices.refresh(index=reindex["index"])
+            loader.verify_version(reindex["index"])
+            loader.switch_alias(reindex["index"])
+            if hashes:
+                hashes.clear(loader.hashes_key)
+
+            started = Cursor(modified=reindex["started"]).dumps()
+            state.set_states(
+                {state_key: started for state_key in self.etl.state_keys} | {loader.sharded_reindex_state_key: ""}
+            )
+            logger.info("Алиас %s переключён на версию %s", self.etl.index.value, reindex["index"])
+
+    def make_shards(self, count: int) -> list[Shard]:
+        return [Shard(index=self.etl.index.value, number=number, count=count) for number in range(count)]
@@ -0,0 +1,190 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import count
+from logging import config as logging_config
+from queue import Empty, Queue
+from threading import Event, Thread
+
+from config.postgres import PostgresClient, PostgresPool
+from etl.extract.change_feed import FEED_LOST, ChangeFeed
+from etl.extract.data_extract import PostgresExtractor
+from etl.load.data_loader import ElasticsearchLoader
+from etl.pipeline import Pipeline
+from models.etl import ETL
+from state.state import Cursor, State
+from utils.logger import LOGGING_CONFIG
+from utils.metrics import LAG_SECONDS
+from utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+logging_config.dictConfig(LOGGING_CONFIG)
+
+
+@dataclass
+class Job:
+    """Конвейер одного индекса в планировщике."""
+
+    etl: ETL
+    state: State
+    extractor: PostgresExtractor
+    loader: ElasticsearchLoader
+    pipeline: Pipeline
+    due: bool = True
+    running: bool = False
+    turn: int = 0
+
+    def run(self, postgres_client: PostgresClient, max_batches: int | None) -> bool:
+        """
+        Выполняет цикл ETL индекса, не больше max_batches пачек, на выданном соединении с Postgres.
+        Возвращает True, если изменений больше нет.
+        """
+        self.extractor.postgres_client = postgres_client
+
+        try:
+            with tracer.span("etl_run", index=self.etl.index.value):
+                finished = self._run(max_batches)
+        finally:
+            tracer.flush()
+
+        if finished:
+            for state_key in self.etl.state_keys:
+                LAG_SECONDS.labels(self.etl.index.value, state_key).set(0)
+        return finished
+
+    def _run(self, max_batches: int | None) -> bool:
+        """
+        Полная загрузка в новую версию индекса идёт, пока индекса нет, его маппинг отстал от тела индекса,
+        позиции сброшены на начало или начатая загрузка не завершена.
+        Прерванная загрузка продолжается в ту же версию при следующем запуске.
+        Пока идёт загрузка по диапазонам, запуск пропускается: позиции после неё выставит она.
+        """
+        if self.loader.sharded_reindex_in_progress():
+            logger.info("Индекс %s загружается по диапазонам, запуск пропущен", self.etl.index.value)
+            return True
+
+        full_reindex = self.loader.reindex_in_progress() or self.loader.index_outdated() or self.reset_requested()
+        if full_reindex:
+            self.loader.begin_reindex(self.etl.state_keys)
+
+        try:
+            finished = self.pipeline.run(max_batches)
+        finally:
+            self.state.flush()
+            self.loader.use_version(None)
+
+        if full_reindex and finished:
+            self.loader.finish_reindex()
+        return finished
+
+    def reset_requested(self) -> bool:
+        """
+        Все позиции сброшены на начало, а индекс не пуст: состояние сброшено для полной загрузки.
+        Позиции пустых таблиц остаются на начале и после загрузки, но индекс по ним тоже пуст.
+        """
+        cursors = self.state.get_cursors(self.etl.state_keys)
+        return all(cursor == Cursor() for cursor in cursors.values()) and not self.loader.index_empty()
+
+
+@dataclass
+class Scheduler:
+    """
+    Планировщик конвейеров всех индексов.
+    Конвейеры выполняются в общем пуле из workers потоков, каждому запуску выдаётся
+    соединение из пула postgres_pool. Запуск ограничен batches_per_run пачками, после чего
+    индекс встаёт в очередь за остальными: полная загрузка одного индекса не задерживает другие.
+    Готовые индексы запускаются по очереди, при равной очереди первым идёт больший ETL.priority.
+    """
+
+    jobs: list[Job]
+    postgres_pool: PostgresPool
+    workers: int
+    change_feed: ChangeFeed
+    poll_timeout: float
+    idle_timeout: float
+    batches_per_run: int | None = None
+    _turns: count = field(default_factory=lambda: count(1), init=False, repr=False)
+    _next_poll: float = field(default=0.0, init=False, repr=False)
+
+    def run(self) -> None:
+        """Запускает конвейеры по изменениям и по таймеру, пока процесс не остановят."""
+        events = Queue()
+
+        stop = Event()
+        listener = Thread(target=self.change_feed.listen, args=(events.put, stop), name="change-feed", daemon=True)
+        listener.start()
+
+        self._next_poll = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="etl") as executor:
+                while True:
+                    if time.monotonic() >= self._next_poll:
+                        self._next_poll = self._poll()
+
+                    self._submit(executor, events)
+
+                    try:
+                        event = events.get(timeout=max(self._next_poll - time.monotonic(), 0))
+                    except Empty:
+                        continue
+                    self._handle(event)
+        finally:
+            stop.set()
+
+    def _poll(self) -> float:
+        """Помечает все индексы к запуску по таймеру. Возвращает время следующего опроса."""
+        for job in self.jobs:
+            job.due = True
+        timeout = self.idle_timeout if self.change_feed.active else self.poll_timeout
+        return time.monotonic() + timeout
+
+    def _submit(self, executor: ThreadPoolExecutor, events: Queue) -> None:
+        """Запускает готовые индексы, пока есть свободные потоки."""
+        for job in self.ready()[: self.workers - self.running()]:
+            job.due, job.running = False, True
+            executor.submit(self._run_job, job, events)
+
+    def running(self) -> int:
+        """Количество выполняющихся конвейеров."""
+        return sum(job.running for job in self.jobs)
+
+    def ready(self) -> list[Job]:
+        """Индексы, ожидающие запуска, в порядке очереди."""
+        return sorted(
+            (job for job in self.jobs if job.due and not job.running), key=lambda job: (job.turn, -job.etl.priority)
+        )
+
+    def _run_job(self, job: Job, events: Queue) -> None:
+        finished = True
+        try:
+            with self.postgres_pool.client() as postgres_client:
+                finished = job.run(postgres_client, job.etl.batches_per_run or self.batches_per_run)
+        except Exception as e:
+            logger.error("❌  Ошибка в ETL процессе для индекса %s: %s", job.etl.index.value, str(e), exc_info=True)
+        finally:
+            events.put((job, finished))
+
+    def _handle(self, event: str | tuple[Job, bool]) -> None:
+        """
+        Изменение таблицы помечает зависящие от неё индексы, завершение запуска освобождает индекс.
+        Потеря подписки переносит опрос на сейчас, не дожидаясь idle_timeout.
+        """
+        if event == FEED_LOST:
+            logger.info("Подписка на изменения потеряна, индексы опрашиваются каждые %s с", self.poll_timeout)
+            self._next_poll = time.monotonic()
+            return
+
+        if isinstance(event, str):
+            for job in self.jobs:
+                if event in {table.value for table in job.etl.tables}:
+                    job.due = True
+            return
+
+        job, finished = event
+        job.running = False
+        job.turn = next(self._turns)
+        job.due = job.due or not finished
+
+        if finished:
+            logger.info("%s ETL завершён, ожидаем изменений", job.etl.index.value)
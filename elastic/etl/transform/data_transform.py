@@ -1,19 +1,109 @@
+import asyncio
 import logging
-from dataclasses import dataclass
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 from logging import config as logging_config
+from multiprocessing import get_context
+from typing import Callable, Iterable, Iterator
 
+from etl.transform.document_mapper import DocumentMapper
 from models.genre import GenreDTO
 from models.movie import MovieDTO
 from models.person import PersonInfoDTO
 from utils.logger import LOGGING_CONFIG
+from utils.metrics import TRANSFORM_SECONDS
+from utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 logging_config.dictConfig(LOGGING_CONFIG)
 
 
+def transform_batch(model: type[GenreDTO | MovieDTO | PersonInfoDTO], batch: list[dict]) -> list[dict]:
+    """Преобразует пачку строк в документы индекса."""
+    return [model(**data).model_dump(by_alias=True) for data in batch]
+
+
+def timed(converter: Callable[[list[dict]], list[dict]], batch: list[dict]) -> tuple[list[dict], int, int]:
+    """
+    Преобразует пачку и возвращает время начала и конца в наносекундах Unix:
+    метрики и трассировка процессов пула собираются в основном процессе.
+    """
+    started = time.time_ns()
+    return converter(batch), started, time.time_ns()
+
+
 @dataclass
 class DataTransform:
+    """
+    Преобразование строк Postgres в документы Elasticsearch.
+    При fast строки переносятся в действия bulk без валидации Pydantic (см. DocumentMapper).
+    При workers > 0 пачки преобразуются в пуле процессов, чтобы преобразование
+    не конкурировало за GIL с потоками чтения и загрузки.
+    """
+
     model: type[GenreDTO | MovieDTO | PersonInfoDTO]
+    index: str = ""
+    workers: int = 0
+    fast: bool = False
+    validate_sample: float = 0.0
+    converter: Callable[[list[dict]], list[dict]] = field(init=False, repr=False)
+    _pool: ProcessPoolExecutor | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.fast:
+            self.converter = DocumentMapper(self.model, self.validate_sample)
+        else:
+            self.converter = partial(transform_batch, self.model)
 
     def data_transform(self, batch: list[dict]) -> list[dict]:
-        return [self.model(**data).model_dump(by_alias=True) for data in batch]
+        return self.observe(*self.convert(batch))
+
+    def convert(self, batch: list[dict]) -> tuple[list[dict], int, int]:
+        """Преобразует пачку в текущем процессе, см. timed."""
+        with tracer.profile("transform"):
+            return timed(self.converter, batch)
+
+    def observe(self, documents: list[dict], started: int, ended: int) -> list[dict]:
+        """Учитывает время преобразования пачки в метриках и трассировке индекса."""
+        TRANSFORM_SECONDS.labels(self.index).observe((ended - started) / 1e9)
+        tracer.record("data_transform", started, ended, index=self.index, documents=len(documents))
+        return documents
+
+    def transform_batches(self, batches: Iterable[list[dict]]) -> Iterator[list[dict]]:
+        """Преобразует поток пачек, сохраняя их порядок. В работе одновременно не больше workers + 1 пачек."""
+        if self.workers <= 0:
+            for batch in batches:
+                yield self.data_transform(batch)
+            return
+
+        pending = deque()
+        for batch in batches:
+            pending.append(self.pool.submit(timed, self.converter, batch))
+            if len(pending) > self.workers:
+                yield self.observe(*pending.popleft().result())
+
+        while pending:
+            yield self.observe(*pending.popleft().result())
+
+    async def transform_async(self, batch: list[dict]) -> list[dict]:
+        """Преобразует пачку, не блокируя цикл событий: в пуле процессов или в отдельном потоке."""
+        if self.workers > 0:
+            return self.observe(*await asyncio.wrap_future(self.pool.submit(timed, self.converter, batch)))
+        return self.observe(*await asyncio.to_thread(self.convert, batch))
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        """Пул процессов, создаётся при первой пачке и живёт до close()."""
+        if self._pool is None:
+            logger.info("Запуск пула преобразования на %s процессов для %s", self.workers, self.model.__name__)
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context("spawn"))
+        return self._pool
+
+    def close(self) -> None:
+        """Останавливает пул процессов."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
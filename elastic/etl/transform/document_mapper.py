@@ -0,0 +1,62 @@
+import logging
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from logging import config as logging_config
+
+import orjson
+from models.genre import GenreDTO
+from models.movie import MovieDTO
+from models.person import PersonInfoDTO
+from pydantic import ValidationError
+from pydantic.fields import FieldInfo
+from utils.logger import LOGGING_CONFIG
+
+logger = logging.getLogger(__name__)
+logging_config.dictConfig(LOGGING_CONFIG)
+
+
+@lru_cache
+def document_fields(model: type[GenreDTO | MovieDTO | PersonInfoDTO]) -> tuple[tuple[str, str, FieldInfo], ...]:
+    """Поля документа индекса: (ключ в документе, ключ в строке, описание поля)."""
+    return tuple((field.alias or name, name, field) for name, field in model.model_fields.items())
+
+
+@dataclass
+class DocumentMapper:
+    """
+    Быстрый путь преобразования для строк, которые Postgres уже собрал в нужную форму.
+    Строка переносится в документ по списку полей модели без валидации Pydantic
+    и сразу сериализуется orjson в действие bulk с _id из строки.
+    Доля validate_sample строк дополнительно проверяется моделью, расхождения пишутся в лог.
+    """
+
+    model: type[GenreDTO | MovieDTO | PersonInfoDTO]
+    validate_sample: float = 0.0
+
+    def __call__(self, batch: list[dict]) -> list[dict]:
+        return [self.to_action(row) for row in batch]
+
+    def to_action(self, row: dict) -> dict:
+        """Действие bulk с готовым JSON документа."""
+        document = {
+            key: row[name] if name in row else field.get_default(call_default_factory=True)
+            for key, name, field in document_fields(self.model)
+        }
+
+        if self.validate_sample and random.random() < self.validate_sample:
+            self.validate(row, document)
+
+        return {"_id": str(row["id"]), "_source": orjson.dumps(document)}
+
+    def validate(self, row: dict, document: dict) -> None:
+        """Сверяет документ быстрого пути с результатом модели."""
+        try:
+            expected = self.model(**row).model_dump(by_alias=True)
+        except ValidationError as error:
+            logger.error("Строка id=%s не проходит валидацию %s: %s", row.get("id"), self.model.__name__, error)
+            return
+
+        expected.pop("_id", None)
+        if orjson.loads(orjson.dumps(expected)) != orjson.loads(orjson.dumps(document)):
+            logger.warning("Документ id=%s расходится с моделью %s", row.get("id"), self.model.__name__)
@@ -1,39 +1,77 @@
+import argparse
 import logging
+import os
 from logging import config as logging_config
-from threading import Thread
 
 from config.settings import settings
+from etl.async_etl import async_etl
 from etl.etl import etl
 from etl.extract.query import Query
-from models.etl import ETL, ETLManager, Indexes, Tables
+from etl.reindex import ShardedReindex
+from models.etl import ETL, ETLManager, Indexes, Producer, Tables
 from models.genre import GenreDTO
 from models.movie import MovieDTO
 from models.person import PersonInfoDTO
 from utils.logger import LOGGING_CONFIG
+from utils.metrics import start_metrics_server
+from utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 logging_config.dictConfig(LOGGING_CONFIG)
 
+ETL_CONFIGS = [
+    ETL(
+        Indexes.MOVIES,
+        Tables.FILM_WORK,
+        MovieDTO,
+        Query.get_films_by_ids_query,
+        producers=[
+            Producer(Tables.FILM_WORK, Query.get_changed_films_ids_query),
+            Producer(Tables.PERSON, Query.get_films_ids_by_persons_query),
+            Producer(Tables.GENRE, Query.get_films_ids_by_genres_query),
+        ],
+        priority=1,
+    ),
+    ETL(Indexes.PERSONS, Tables.PERSON, PersonInfoDTO, Query.get_persons_query),
+    ETL(Indexes.GENRES, Tables.GENRE, GenreDTO, Query.get_genres_query),
+]
+
 
 def main():
-    etl_manager = ETLManager(settings, etl_function=etl)
+    parser = argparse.ArgumentParser(description="ETL из Postgres в Elasticsearch")
+    parser.add_argument(
+        "--trace", default=settings.trace_file, help="файл для интервалов этапов в формате OTLP JSON (TRACE_FILE)"
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        help="каталог для профилей cProfile этапов extract, transform и load; этапы профилируются по очереди",
+    )
+    commands = parser.add_subparsers(dest="command")
+    reindex = commands.add_parser("reindex", help="полная загрузка индекса в новую версию несколькими процессами")
+    reindex.add_argument("index", choices=[config.index.value for config in ETL_CONFIGS if config.producers])
+    reindex.add_argument("--shards", type=int, default=os.cpu_count(), help="количество процессов-диапазонов")
+    args = parser.parse_args()
+    tracer.configure(args.trace, args.profile)
+
+    try:
+        run(args)
+    finally:
+        tracer.flush()
 
-    etl_configs = [
-        ETL(Indexes.MOVIES, Tables.FILM_WORK, MovieDTO, Query.get_films_query),
-        ETL(Indexes.PERSONS, Tables.PERSON, PersonInfoDTO, Query.get_persons_query),
-        ETL(Indexes.GENRES, Tables.GENRE, GenreDTO, Query.get_genres_query),
-    ]
 
-    threads = []
-    for config in etl_configs:
-        thread = Thread(target=etl_manager.run_etl, args=(config,))
-        threads.append(thread)
-        thread.start()
+def run(args: argparse.Namespace) -> None:
+    """Выполняет команду: загрузку индекса по диапазонам или ETL всех индексов."""
+    if args.command == "reindex":
+        etl_config = next(config for config in ETL_CONFIGS if config.index.value == args.index)
+        ShardedReindex(etl_config, settings, args.shards).run()
+        return
 
-    for thread in threads:
-        thread.join()
+    start_metrics_server(settings.metrics_port)
 
-    logger.info("✅ Все ETL процессы запущены в отдельных потоках!")
+    etl_function = {"threads": etl, "asyncio": async_etl}[settings.etl_runtime]
+    etl_manager = ETLManager(settings, etl_function=etl_function)
+    etl_manager.run_etl(ETL_CONFIGS)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from logging import config as logging_config
 from typing import Callable
@@ -27,26 +27,51 @@ class Tables(Enum):
     PERSON = "person"
 
 
+@dataclass
+class Producer:
+    """Источник изменений: таблица и запрос, отдающий затронутые id документов индекса."""
+
+    table: Tables
+    query: Callable[..., SQL]
+
+
 @dataclass
 class ETL:
     index: Indexes
     table: Tables
     model: type[MovieDTO | GenreDTO | PersonInfoDTO]
-    query: Callable[[str], SQL]
+    query: Callable[..., SQL]
+    producers: list[Producer] = field(default_factory=list)
+    priority: int = 0
+    batches_per_run: int | None = None
+
+    def state_key(self, table: Tables) -> str:
+        """Ключ состояния для источника изменений."""
+        return f"{self.index.value}:{table.value}"
+
+    @property
+    def tables(self) -> list[Tables]:
+        """Таблицы, изменения в которых затрагивают индекс."""
+        return list(dict.fromkeys([self.table, *(producer.table for producer in self.producers)]))
+
+    @property
+    def state_keys(self) -> list[str]:
+        """Ключи состояния индекса: по одному на каждый источник изменений."""
+        if not self.producers:
+            return [self.index.value]
+        return [self.state_key(producer.table) for producer in self.producers]
 
 
 @dataclass
 class ETLManager:
     settings: Settings
-    etl_function: Callable[[ETL, Settings], None]
+    etl_function: Callable[[list[ETL], Settings], None]
 
-    def run_etl(self, etl_config: ETL):
-        logger.info(
-            "📊  Старт ETL процесса для индекса: %s и таблицы: %s", etl_config.index.value, etl_config.table.value
-        )
+    def run_etl(self, etl_configs: list[ETL]):
+        logger.info("📊  Старт ETL процесса для индексов: %s", ", ".join(config.index.value for config in etl_configs))
         try:
-            self.etl_function(etl_config, self.settings)
-            logger.info("✅  ETL процесс для индекса %s завершён успешно!", etl_config.index.value)
+            self.etl_function(etl_configs, self.settings)
+            logger.info("✅  ETL процесс завершён успешно!")
         except Exception as e:
-            logger.error("❌  Ошибка в ETL процессе для индекса %s: %s", etl_config.index.value, str(e), exc_info=True)
+            logger.error("❌  Ошибка в ETL процессе: %s", str(e), exc_info=True)
             raise
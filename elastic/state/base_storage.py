@@ -11,3 +11,65 @@ class BaseStorage(abc.ABC):
     @abc.abstractmethod
     def retrieve_state(self, key: str) -> str | None:
         """Извлечь состояние из хранилища."""
+
+    def save_states(self, states: dict[str, str]) -> None:
+        """Сохранить несколько состояний. Хранилища с пакетными командами переопределяют метод."""
+        for key, value in states.items():
+            self.save_state(key, value)
+
+    def retrieve_states(self, keys: list[str]) -> list[str | None]:
+        """Извлечь несколько состояний в порядке keys."""
+        return [self.retrieve_state(key) for key in keys]
+
+
+class BaseHashStorage(abc.ABC):
+    """Базовый класс для хранилища хешей содержимого документов."""
+
+    @abc.abstractmethod
+    def get_hashes(self, key: str, ids: list[str]) -> list[str | None]:
+        """Получить хеши документов в порядке ids."""
+
+    @abc.abstractmethod
+    def save_hashes(self, key: str, hashes: dict[str, str]) -> None:
+        """Сохранить хеши документов."""
+
+    @abc.abstractmethod
+    def clear(self, key: str) -> None:
+        """Удалить все хеши по ключу."""
+
+
+class AsyncBaseStorage(abc.ABC):
+    """Базовый класс для асинхронного хранилища."""
+
+    @abc.abstractmethod
+    async def save_state(self, key: str, value: str) -> None:
+        """Сохранить состояние в хранилище."""
+
+    @abc.abstractmethod
+    async def retrieve_state(self, key: str) -> str | None:
+        """Извлечь состояние из хранилища."""
+
+    async def save_states(self, states: dict[str, str]) -> None:
+        """Сохранить несколько состояний. Хранилища с пакетными командами переопределяют метод."""
+        for key, value in states.items():
+            await self.save_state(key, value)
+
+    async def retrieve_states(self, keys: list[str]) -> list[str | None]:
+        """Извлечь несколько состояний в порядке keys."""
+        return [await self.retrieve_state(key) for key in keys]
+
+
+class AsyncBaseHashStorage(abc.ABC):
+    """Базовый класс для асинхронного хранилища хешей содержимого документов."""
+
+    @abc.abstractmethod
+    async def get_hashes(self, key: str, ids: list[str]) -> list[str | None]:
+        """Получить хеши документов в порядке ids."""
+
+    @abc.abstractmethod
+    async def save_hashes(self, key: str, hashes: dict[str, str]) -> None:
+        """Сохранить хеши документов."""
+
+    @abc.abstractmethod
+    async def clear(self, key: str) -> None:
+        """Удалить все хеши по ключу."""
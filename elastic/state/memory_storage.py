@@ -0,0 +1,58 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from .base_storage import AsyncBaseHashStorage, BaseHashStorage, BaseStorage
+
+
+@dataclass
+class MemoryStorage(BaseStorage):
+    """Хранилище состояния в памяти процесса, например, для замеров: каждый запуск начинается с полной загрузки."""
+
+    states: dict[str, str] = field(default_factory=dict)
+
+    def save_state(self, key: str, value: str) -> None:
+        """Сохранить состояние в хранилище."""
+        self.states[key] = value
+
+    def retrieve_state(self, key: str) -> str | None:
+        """Извлечь состояние из хранилища."""
+        return self.states.get(key)
+
+
+@dataclass
+class MemoryHashStorage(BaseHashStorage):
+    """Хранилище хешей документов в памяти процесса, после перезапуска документы отправляются заново."""
+
+    hashes: defaultdict[str, dict[str, str]] = field(default_factory=lambda: defaultdict(dict))
+
+    def get_hashes(self, key: str, ids: list[str]) -> list[str | None]:
+        """Получить хеши документов в порядке ids."""
+        stored = self.hashes[key]
+        return [stored.get(doc_id) for doc_id in ids]
+
+    def save_hashes(self, key: str, hashes: dict[str, str]) -> None:
+        """Сохранить хеши документов."""
+        self.hashes[key].update(hashes)
+
+    def clear(self, key: str) -> None:
+        """Удалить все хеши по ключу."""
+        self.hashes.pop(key, None)
+
+
+@dataclass
+class AsyncMemoryHashStorage(AsyncBaseHashStorage):
+    """Асинхронный интерфейс к хранилищу хешей в памяти процесса."""
+
+    storage: MemoryHashStorage = field(default_factory=MemoryHashStorage)
+
+    async def get_hashes(self, key: str, ids: list[str]) -> list[str | None]:
+        """Получить хеши документов в порядке ids."""
+        return self.storage.get_hashes(key, ids)
+
+    async def save_hashes(self, key: str, hashes: dict[str, str]) -> None:
+        """Сохранить хеши документов."""
+        self.storage.save_hashes(key, hashes)
+
+    async def clear(self, key: str) -> None:
+        """Удалить все хеши по ключу."""
+        self.storage.clear(key)
@@ -1,8 +1,8 @@
 from dataclasses import dataclass
 
-from config.redis import RedisClient
+from config.redis import AsyncRedisClient, RedisClient
 
-from .base_storage import BaseStorage
+from .base_storage import AsyncBaseHashStorage, AsyncBaseStorage, BaseHashStorage, BaseStorage
 
 
 @dataclass
@@ -19,3 +19,77 @@ class RedisStorage(BaseStorage):
         """Получить состояние из хранилища."""
         value = self.redis_client.get(key)
         return value.decode() if value else None
+
+    def save_states(self, states: dict[str, str]) -> None:
+        """Сохранить несколько состояний одной командой MSET."""
+        self.redis_client.mset(states)
+
+    def retrieve_states(self, keys: list[str]) -> list[str | None]:
+        """Извлечь несколько состояний одной командой MGET."""
+        values = self.redis_client.mget(keys) or [None] * len(keys)
+        return [value.decode() if value else None for value in values]
+
+
+@dataclass
+class RedisHashStorage(BaseHashStorage):
+    """Хранилище хешей документов в хеше Redis."""
+
+    redis_client: RedisClient
+
+    def get_hashes(self, key: str, ids: list[str]) -> list[str | None]:
+        """Получить хеши документов в порядке ids."""
+        values = self.redis_client.hmget(key, ids) or [None] * len(ids)
+        return [value.decode() if value else None for value in values]
+
+    def save_hashes(self, key: str, hashes: dict[str, str]) -> None:
+        """Сохранить хеши документов."""
+        self.redis_client.hset(key, hashes)
+
+    def clear(self, key: str) -> None:
+        """Удалить все хеши по ключу."""
+        self.redis_client.delete(key)
+
+
+@dataclass
+class AsyncRedisStorage(AsyncBaseStorage):
+    """Асинхронное хранилище состояния в Redis."""
+
+    redis_client: AsyncRedisClient
+
+    async def save_state(self, key: str, value: str) -> None:
+        """Сохранить состояние в хранилище."""
+        await self.redis_client.set(key, value)
+
+    async def retrieve_state(self, key: str) -> str | None:
+        """Получить состояние из хранилища."""
+        value = await self.redis_client.get(key)
+        return value.decode() if value else None
+
+    async def save_states(self, states: dict[str, str]) -> None:
+        """Сохранить несколько состояний одной командой MSET."""
+        await self.redis_client.mset(states)
+
+    async def retrieve_states(self, keys: list[str]) -> list[str | None]:
+        """Извлечь несколько состояний одной командой MGET."""
+        values = await self.redis_client.mget(keys) or [None] * len(keys)
+        return [value.decode() if value else None for value in values]
+
+
+@dataclass
+class AsyncRedisHashStorage(AsyncBaseHashStorage):
+    """Асинхронное хранилище хешей документов в хеше Redis."""
+
+    redis_client: AsyncRedisClient
+
+    async def get_hashes(self, key: str, ids: list[str]) -> list[str | None]:
+        """Получить хеши документов в порядке ids."""
+        values = await self.redis_client.hmget(key, ids) or [None] * len(ids)
+        return [value.decode() if value else None for value in values]
+
+    async def save_hashes(self, key: str, hashes: dict[str, str]) -> None:
+        """Сохранить хеши документов."""
+        await self.redis_client.hset(key, hashes)
+
+    async def clear(self, key: str) -> None:
+        """Удалить все хеши по ключу."""
+        await self.redis_client.delete(key)
@@ -1,27 +1,162 @@
+import json
 import logging
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
 from logging import config as logging_config
+from threading import Lock
+from uuid import UUID
 
 from utils.logger import LOGGING_CONFIG
 
-from .base_storage import BaseStorage
+from .base_storage import AsyncBaseStorage, BaseStorage
 
 logger = logging.getLogger(__name__)
 logging_config.dictConfig(LOGGING_CONFIG)
 
 
+@dataclass(frozen=True)
+class Cursor:
+    """Позиция чтения источника: последняя загруженная пара (modified, id)."""
+
+    modified: str = str(datetime.min)
+    id: str = str(UUID(int=0))
+
+    @classmethod
+    def from_row(cls, row: dict) -> "Cursor":
+        """Позиция сразу после строки результата."""
+        return cls(modified=str(row["modified"]), id=str(row["id"]))
+
+    @classmethod
+    def loads(cls, value: str) -> "Cursor":
+        """Читает позицию из хранилища, старое значение-метка времени считается позицией без id."""
+        try:
+            return cls(**json.loads(value))
+        except json.JSONDecodeError:
+            return cls(modified=value)
+
+    def dumps(self) -> str:
+        """Сериализует позицию для хранилища."""
+        return json.dumps(asdict(self))
+
+
 @dataclass
 class State:
-    """Класс для работы с состояниями."""
+    """
+    Класс для работы с состояниями.
+    Позиции чтения копятся в памяти и сохраняются одной командой каждые flush_every позиций (write-behind),
+    при flush_every=1 каждая позиция сохраняется сразу. Остальные состояния сохраняются сразу вместе
+    с накопленными позициями. После падения процесса загрузка повторится не больше чем с flush_every
+    пачек назад, повторная загрузка документа идемпотентна.
+    """
 
     storage: BaseStorage
+    flush_every: int = 1
+    _pending: dict[str, str] = field(default_factory=dict, init=False, repr=False)
+    _unflushed: int = field(default=0, init=False, repr=False)
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False)
 
     def set_state(self, key: str, value: str) -> None:
         """Устанавливает состояние по ключу."""
-        logging.info("Сохраняем состояние %s", key)
-        self.storage.save_state(key, value)
+        self.set_states({key: value})
 
     def get_state(self, key: str) -> str | None:
         """Получает состояние по ключу."""
-        logging.info("Получаем текущее состояние %s", key)
-        return self.storage.retrieve_state(key)
+        return self.get_states([key])[key]
+
+    def set_states(self, states: dict[str, str]) -> None:
+        """Устанавливает несколько состояний одной командой."""
+        logger.debug("Сохраняем состояния %s", list(states))
+        with self._lock:
+            self._pending.update(states)
+            self._flush()
+
+    def get_states(self, keys: list[str]) -> dict[str, str | None]:
+        """Получает несколько состояний одной командой, несохранённые позиции берутся из памяти."""
+        logger.debug("Получаем текущие состояния %s", keys)
+        with self._lock:
+            pending = {key: self._pending[key] for key in keys if key in self._pending}
+
+        missing = [key for key in keys if key not in pending]
+        stored = dict(zip(missing, self.storage.retrieve_states(missing))) if missing else {}
+        return {key: pending[key] if key in pending else stored.get(key) for key in keys}
+
+    def set_cursor(self, key: str, cursor: Cursor) -> None:
+        """Сохраняет позицию чтения по ключу."""
+        with self._lock:
+            self._pending[key] = cursor.dumps()
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self._flush()
+
+    def get_cursor(self, key: str) -> Cursor | None:
+        """Получает позицию чтения по ключу."""
+        return self.get_cursors([key])[key]
+
+    def get_cursors(self, keys: list[str]) -> dict[str, Cursor | None]:
+        """Получает позиции чтения по ключам одной командой."""
+        return {key: Cursor.loads(value) if value else None for key, value in self.get_states(keys).items()}
+
+    def flush(self) -> None:
+        """Сохраняет накопленные позиции."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            self.storage.save_states(self._pending)
+            self._pending = {}
+        self._unflushed = 0
+
+
+@dataclass
+class AsyncState:
+    """Асинхронный вариант State."""
+
+    storage: AsyncBaseStorage
+    flush_every: int = 1
+    _pending: dict[str, str] = field(default_factory=dict, init=False, repr=False)
+    _unflushed: int = field(default=0, init=False, repr=False)
+
+    async def set_state(self, key: str, value: str) -> None:
+        """Устанавливает состояние по ключу."""
+        await self.set_states({key: value})
+
+    async def get_state(self, key: str) -> str | None:
+        """Получает состояние по ключу."""
+        return (await self.get_states([key]))[key]
+
+    async def set_states(self, states: dict[str, str]) -> None:
+        """Устанавливает несколько состояний одной командой."""
+        logger.debug("Сохраняем состояния %s", list(states))
+        self._pending.update(states)
+        await self.flush()
+
+    async def get_states(self, keys: list[str]) -> dict[str, str | None]:
+        """Получает несколько состояний одной командой, несохранённые позиции берутся из памяти."""
+        logger.debug("Получаем текущие состояния %s", keys)
+        pending = {key: self._pending[key] for key in keys if key in self._pending}
+
+        missing = [key for key in keys if key not in pending]
+        stored = dict(zip(missing, await self.storage.retrieve_states(missing))) if missing else {}
+        return {key: pending[key] if key in pending else stored.get(key) for key in keys}
+
+    async def set_cursor(self, key: str, cursor: Cursor) -> None:
+        """Сохраняет позицию чтения по ключу."""
+        self._pending[key] = cursor.dumps()
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every:
+            await self.flush()
+
+    async def get_cursor(self, key: str) -> Cursor | None:
+        """Получает позицию чтения по ключу."""
+        return (await self.get_cursors([key]))[key]
+
+    async def get_cursors(self, keys: list[str]) -> dict[str, Cursor | None]:
+        """Получает позиции чтения по ключам одной командой."""
+        return {key: Cursor.loads(value) if value else None for key, value in (await self.get_states(keys)).items()}
+
+    async def flush(self) -> None:
+        """Сохраняет накопленные позиции."""
+        pending, self._pending, self._unflushed = self._pending, {}, 0
+        if pending:
+            await self.storage.save_states(pending)
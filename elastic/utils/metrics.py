@@ -0,0 +1,77 @@
+import logging
+import time
+from datetime import datetime, timezone
+from logging import config as logging_config
+from typing import Any, Iterator
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram, start_http_server
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from .logger import LOGGING_CONFIG
+
+logger = logging.getLogger(__name__)
+logging_config.dictConfig(LOGGING_CONFIG)
+
+SECONDS_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+ROWS_EXTRACTED = Counter("etl_rows_extracted", "Строк прочитано из Postgres", ["index"])
+TRANSFORM_SECONDS = Histogram(
+    "etl_transform_seconds", "Время преобразования пачки", ["index"], buckets=SECONDS_BUCKETS
+)
+BULK_SECONDS = Histogram(
+    "etl_bulk_seconds", "Время загрузки пачки в Elasticsearch", ["index"], buckets=SECONDS_BUCKETS
+)
+BULK_BYTES = Counter("etl_bulk_bytes", "Байт документов отправлено в Elasticsearch", ["index"])
+DOCUMENTS_LOADED = Counter("etl_documents_loaded", "Документов загружено", ["index"])
+DOCUMENTS_SKIPPED = Counter("etl_documents_skipped", "Документов пропущено без изменений", ["index"])
+DOCUMENTS_FAILED = Counter("etl_documents_failed", "Документов не принято Elasticsearch", ["index"])
+LAG_SECONDS = Gauge(
+    "etl_lag_seconds",
+    "Отставание индекса: текущее время минус сохранённая позиция, 0 после загрузки всех изменений",
+    ["index", "state_key"],
+)
+
+
+class ClientStatsCollector(Collector):
+    """Статистика соединений клиентов из config: созданные соединения, счётчики пулов."""
+
+    def __init__(self, clients: dict[str, Any]):
+        self.clients = clients
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        family = GaugeMetricFamily(
+            "etl_client_connections", "Статистика соединений клиента", labels=["client", "stat"]
+        )
+        for name, client in self.clients.items():
+            for stat, value in client.stats().items():
+                family.add_metric([name, stat], value)
+        yield family
+
+
+def register_clients(clients: dict[str, Any]) -> None:
+    """Публикует статистику соединений клиентов."""
+    REGISTRY.register(ClientStatsCollector(clients))
+
+
+def observe_lag(index: str, state_key: str, modified: str) -> None:
+    """
+    Обновляет отставание по позиции источника. Время без часового пояса считается UTC,
+    начальная позиция полной загрузки пропускается.
+    """
+    try:
+        checkpoint = datetime.fromisoformat(modified)
+    except ValueError:
+        return
+    if checkpoint.replace(tzinfo=None) == datetime.min:
+        return
+    if checkpoint.tzinfo is None:
+        checkpoint = checkpoint.replace(tzinfo=timezone.utc)
+    LAG_SECONDS.labels(index, state_key).set(max(time.time() - checkpoint.timestamp(), 0))
+
+
+def start_metrics_server(port: int) -> None:
+    """Запускает HTTP-сервер метрик в фоновом потоке, port=0 отключает метрики."""
+    if port:
+        start_http_server(port)
+        logger.info("Метрики Prometheus доступны на порту %s", port)
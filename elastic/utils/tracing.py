@@ -0,0 +1,198 @@
+import cProfile
+import json
+import logging
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from logging import config as logging_config
+from pathlib import Path
+from threading import Lock, RLock
+from typing import Any, Iterator
+
+from .logger import LOGGING_CONFIG
+
+logger = logging.getLogger(__name__)
+logging_config.dictConfig(LOGGING_CONFIG)
+
+SERVICE_NAME = "etl"
+SPAN_KIND_INTERNAL = 1
+STATUS_CODE_ERROR = 2
+
+
+def attribute_value(value: Any) -> dict[str, Any]:
+    """Значение атрибута в формате OTLP JSON."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def attributes(values: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": key, "value": attribute_value(value)} for key, value in values.items()]
+
+
+@dataclass
+class Span:
+    """Интервал трассировки: время в наносекундах Unix, родитель — объемлющий интервал того же контекста."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start: int
+    end: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    def to_otlp(self) -> dict[str, Any]:
+        """Интервал в формате OTLP JSON."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": SPAN_KIND_INTERNAL,
+            "startTimeUnixNano": str(self.start),
+            "endTimeUnixNano": str(self.end),
+            "attributes": attributes(self.attributes),
+        }
+        if self.error:
+            span["status"] = {"code": STATUS_CODE_ERROR, "message": self.error}
+        return span
+
+
+_current: ContextVar[Span | None] = ContextVar("span", default=None)
+
+
+class Tracer:
+    """
+    Трассировка и профилирование этапов ETL, по умолчанию выключены.
+    Интервалы копятся в памяти и по flush() дописываются в path строкой JSON в формате
+    OTLP ExportTraceServiceRequest, как у файлового экспортёра OpenTelemetry Collector.
+    При profile_dir вызовы этапов профилируются cProfile, профили суммируются и по flush()
+    сохраняются в {profile_dir}/{этап}.prof.
+    Профилируемые вызовы выполняются по одному: с Python 3.12 профилировщик видит все потоки процесса.
+    """
+
+    def __init__(self):
+        self.path: Path | None = None
+        self.profile_dir: Path | None = None
+        self._spans: list[Span] = []
+        self._lock = Lock()
+        self._profile_lock = RLock()
+        self._profiling = False
+        self._profiles: dict[str, pstats.Stats] = {}
+
+    def configure(self, path: str | None, profile_dir: str | None) -> None:
+        """Включает трассировку в файл path и профилирование в каталог profile_dir."""
+        self.path = Path(path) if path else None
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        if self.path:
+            logger.info("Трассировка этапов ETL пишется в %s", self.path)
+        if self.profile_dir:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            logger.info("Профили этапов ETL пишутся в %s", self.profile_dir)
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    @contextmanager
+    def span(self, name: str, **values: Any) -> Iterator[Span | None]:
+        """Интервал вокруг блока кода. Интервалы внутри блока, в том числе в задачах asyncio, — его дети."""
+        if not self.enabled:
+            yield None
+            return
+
+        span = self._start(name, time.time_ns(), values)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as error:
+            span.error = repr(error)
+            raise
+        finally:
+            _current.reset(token)
+            span.end = time.time_ns()
+            self._finish(span)
+
+    def record(self, name: str, start: int, end: int, **values: Any) -> None:
+        """Добавляет завершённый интервал, измеренный в другом месте, например, в процессе пула."""
+        if self.enabled:
+            span = self._start(name, start, values)
+            span.end = end
+            self._finish(span)
+
+    def flush(self) -> None:
+        """Дописывает накопленные интервалы в файл трассировки и сохраняет профили этапов."""
+        with self._profile_lock:
+            for stage, stats in self._profiles.items():
+                stats.dump_stats(self.profile_dir / f"{stage}.prof")
+
+        with self._lock:
+            spans, self._spans = self._spans, []
+        if not spans:
+            return
+
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": attributes({"service.name": SERVICE_NAME})},
+                    "scopeSpans": [{"scope": {"name": __name__}, "spans": [span.to_otlp() for span in spans]}],
+                }
+            ]
+        }
+        with self._lock, self.path.open("a", encoding="utf-8") as file:
+            file.write(json.dumps(request, ensure_ascii=False) + "\n")
+
+    @contextmanager
+    def profile(self, stage: str) -> Iterator[None]:
+        """Профилирует блок кода как вызов этапа stage. Вложенные вызовы входят в профиль внешнего."""
+        if not self.profile_dir:
+            yield
+            return
+
+        with self._profile_lock:
+            if self._profiling:
+                yield
+                return
+
+            profiler = cProfile.Profile()
+            self._profiling = True
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                self._profiling = False
+                self._save_profile(stage, profiler)
+
+    def _start(self, name: str, start: int, values: dict[str, Any]) -> Span:
+        parent = _current.get()
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent else None,
+            start=start,
+            attributes=values,
+        )
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def _save_profile(self, stage: str, profiler: cProfile.Profile) -> None:
+        if stage in self._profiles:
+            self._profiles[stage].add(profiler)
+        else:
+            self._profiles[stage] = pstats.Stats(profiler)
+
+
+tracer = Tracer()
@@ -3,6 +3,7 @@ from typing import Annotated
 from fastapi_cache.decorator import cache
 from src.models.film import MovieBaseDTO, MovieInfoDTO
 from src.services.film_service import FilmService, get_film_service
+from src.utils.pagination import set_next_cursor
 
 from fastapi import APIRouter, Depends, Path, Query, Request, Response
 
@@ -13,9 +14,8 @@ router = APIRouter()
     "/",
     response_model=list[MovieBaseDTO],
     summary="Get films",
-    description="Get films with genre, sort and pagination.",
+    description="Get films with genre and rating filters, sort and pagination by page number or by cursor.",
 )
-@cache(expire=60)
 async def get_films(
     request: Request,
     response: Response,
@@ -26,6 +26,29 @@ async def get_films(
             description="Genre name for the items to search in the database",
         ),
     ] = None,
+    genre_id: Annotated[
+        str | None,
+        Query(
+            title="genre id",
+            description="Genre id for the items to search in the database",
+        ),
+    ] = None,
+    rating_min: Annotated[
+        float | None,
+        Query(
+            title="minimal rating",
+            description="Lowest IMDb rating of the items, inclusive",
+            ge=0,
+        ),
+    ] = None,
+    rating_max: Annotated[
+        float | None,
+        Query(
+            title="maximal rating",
+            description="Highest IMDb rating of the items, inclusive",
+            ge=0,
+        ),
+    ] = None,
     page_size: Annotated[
         int,
         Query(
@@ -49,9 +72,65 @@ async def get_films(
             description="To sort by rating",
         ),
     ] = "imdb_rating",
+    cursor: Annotated[
+        str | None,
+        Query(
+            title="page cursor",
+            description="Cursor from the X-Next-Cursor header of the previous page, empty for the first page. "
+            "Page number is ignored with cursor.",
+        ),
+    ] = None,
     film_service: FilmService = Depends(get_film_service),
 ) -> list[MovieBaseDTO]:
-    return await film_service.search(genre=genre, page_number=page_number, page_size=page_size, sort=sort)
+    if cursor is not None:
+        films, next_cursor = await film_service.search_after(
+            cursor=cursor,
+            genre=genre,
+            genre_id=genre_id,
+            rating_min=rating_min,
+            rating_max=rating_max,
+            page_size=page_size,
+            sort=sort,
+        )
+        set_next_cursor(response, next_cursor)
+        return films
+    return await films_page(
+        request=request,
+        response=response,
+        genre=genre,
+        genre_id=genre_id,
+        rating_min=rating_min,
+        rating_max=rating_max,
+        page_number=page_number,
+        page_size=page_size,
+        sort=sort,
+        film_service=film_service,
+    )
+
+
+@cache(expire=60)
+async def films_page(
+    request: Request,
+    response: Response,
+    genre: str | None,
+    genre_id: str | None,
+    rating_min: float | None,
+    rating_max: float | None,
+    page_number: int,
+    page_size: int,
+    sort: str,
+    film_service: FilmService,
+) -> list[MovieBaseDTO]:
+    """Страница по номеру кешируется, страницы по курсору нет: курсор следующей страницы передаётся в заголовке."""
+    return await film_service.search(
+        genre=genre,
+        genre_id=genre_id,
+        rating_min=rating_min,
+        rating_max=rating_max,
+        page_number=page_number,
+        page_size=page_size,
+        sort=sort,
+    )
 
 
 @router.get(
@@ -80,9 +159,8 @@ async def film_details(
     "/search/",
     response_model=list[MovieBaseDTO],
     summary="Get films from search",
-    description="Get films from search with sort and pagination.",
+    description="Get films from search with sort and pagination by page number or by cursor.",
 )
-@cache(expire=60)
 async def search_films(
     request: Request,
     response: Response,
@@ -109,10 +187,53 @@ async def search_films(
             description="Words for search of items in the database",
         ),
     ] = None,
+    rating_tiebreak: Annotated[
+        bool,
+        Query(
+            title="rating tiebreak",
+            description="Order equally relevant films by rating",
+        ),
+    ] = True,
+    cursor: Annotated[
+        str | None,
+        Query(
+            title="page cursor",
+            description="Cursor from the X-Next-Cursor header of the previous page, empty for the first page. "
+            "Page number is ignored with cursor.",
+        ),
+    ] = None,
     film_service: FilmService = Depends(get_film_service),
+) -> list[MovieBaseDTO]:
+    if cursor is not None:
+        films, next_cursor = await film_service.search_after(
+            cursor=cursor, page_size=page_size, title=query, rating_tiebreak=rating_tiebreak
+        )
+        set_next_cursor(response, next_cursor)
+        return films
+    return await search_films_page(
+        request=request,
+        response=response,
+        page_number=page_number,
+        page_size=page_size,
+        query=query,
+        rating_tiebreak=rating_tiebreak,
+        film_service=film_service,
+    )
+
+
+@cache(expire=60)
+async def search_films_page(
+    request: Request,
+    response: Response,
+    page_number: int,
+    page_size: int,
+    query: str | None,
+    rating_tiebreak: bool,
+    film_service: FilmService,
 ) -> list[MovieBaseDTO]:
     return await film_service.search(
         page_number=page_number,
         page_size=page_size,
         title=query,
+        rating_tiebreak=rating_tiebreak,
     )
@@ -5,6 +5,7 @@ from src.models.film import MovieBaseDTO
 from src.models.person import PersonInfoDTO
 from src.services.film_service import FilmService, get_film_service
 from src.services.person_service import PersonService, get_person_service
+from src.utils.pagination import set_next_cursor
 
 from fastapi import APIRouter, Depends, Path, Query, Request, Response
 
@@ -37,9 +38,8 @@ async def person_details(
     "/search/",
     response_model=list[PersonInfoDTO],
     summary="Get persons from search",
-    description="Get persons from search with sort and pagination.",
+    description="Get persons from search with sort and pagination by page number or by cursor.",
 )
-@cache(expire=60)
 async def search_person(
     request: Request,
     response: Response,
@@ -66,7 +66,38 @@ async def search_person(
             description="Words for search of items in the database",
         ),
     ] = None,
+    cursor: Annotated[
+        str | None,
+        Query(
+            title="page cursor",
+            description="Cursor from the X-Next-Cursor header of the previous page, empty for the first page. "
+            "Page number is ignored with cursor.",
+        ),
+    ] = None,
     person_service: PersonService = Depends(get_person_service),
+) -> list[PersonInfoDTO]:
+    if cursor is not None:
+        persons, next_cursor = await person_service.search_after(cursor=cursor, page_size=page_size, full_name=query)
+        set_next_cursor(response, next_cursor)
+        return persons
+    return await search_person_page(
+        request=request,
+        response=response,
+        page_number=page_number,
+        page_size=page_size,
+        query=query,
+        person_service=person_service,
+    )
+
+
+@cache(expire=60)
+async def search_person_page(
+    request: Request,
+    response: Response,
+    page_number: int,
+    page_size: int,
+    query: str | None,
+    person_service: PersonService,
 ) -> list[PersonInfoDTO]:
     return await person_service.search(
         page_number=page_number,
@@ -96,4 +127,4 @@ async def get_films(
     film_service: FilmService = Depends(get_film_service),
 ) -> list[MovieBaseDTO]:
     person = await person_service.get_by_id(person_id)
-    return [await film_service.get_by_id(film.id) for film in person.films]
+    return await film_service.get_many([str(film.id) for film in person.films])
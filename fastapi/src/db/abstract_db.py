@@ -1,12 +1,21 @@
 from abc import ABC, abstractmethod
 
 
+class InvalidCursorError(Exception):
+    """Курсор пагинации повреждён или устарел."""
+
+
 class AbstractDAO(ABC):
     """Базовый класс для поиска в БД."""
 
     @abstractmethod
-    async def get(self, table: str, id_obj: str) -> dict[str, str] | None:
-        """Получение объекта по id."""
+    async def get(self, table: str, id_obj: str, source: list[str] | None = None) -> dict[str, str] | None:
+        """Получение объекта по id, source ограничивает поля объекта."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_many(self, table: str, ids: list[str], source: list[str] | None = None) -> list[dict[str, str]]:
+        """Получение объектов по списку id одним запросом, в порядке ids, без ненайденных."""
         raise NotImplementedError
 
     @abstractmethod
@@ -17,6 +26,29 @@ class AbstractDAO(ABC):
         limit: int = 50,
         sort: list[dict[str, str]] | None = None,
         filters: dict[str, any] | None = None,
+        source: list[str] | None = None,
+        query: dict | None = None,
     ):
-        """Поиск объектов в таблице."""
+        """
+        Поиск объектов в таблице, source ограничивает поля объектов.
+        filters сопоставляет полю строку для поиска по тексту или точный фильтр Term или Range,
+        query заменяет поиск по тексту из filters.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def search_after(
+        self,
+        table: str,
+        cursor: str | None = None,
+        limit: int = 50,
+        sort: list[dict[str, str]] | None = None,
+        filters: dict[str, any] | None = None,
+        source: list[str] | None = None,
+        query: dict | None = None,
+    ) -> tuple[list[dict[str, str]], str | None]:
+        """
+        Поиск объектов в таблице с пагинацией по курсору.
+        Возвращает страницу и курсор следующей страницы, None на последней странице.
+        """
         raise NotImplementedError
@@ -1,14 +1,32 @@
+import base64
+import json
 import logging
 
-from elasticsearch import AsyncElasticsearch, NotFoundError, TransportError
+from elasticsearch import AsyncElasticsearch, BadRequestError, NotFoundError, TransportError
 from elasticsearch.exceptions import ConnectionError as ElasticsearchError
-from src.db.abstract_db import AbstractDAO
+from src.db.abstract_db import AbstractDAO, InvalidCursorError
+from src.db.filters import Filter, Term
 from src.utils.backoff import backoff
 
 from fastapi import Request
 
 logger = logging.getLogger(__name__)
 
+PIT_KEEP_ALIVE = "1m"
+
+
+def encode_cursor(pit_id: str, after: list) -> str:
+    """Непрозрачный курсор: id точки во времени и значения сортировки последнего объекта страницы."""
+    return base64.urlsafe_b64encode(json.dumps({"pit": pit_id, "after": after}).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, list]:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return data["pit"], data["after"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError(cursor) from e
+
 
 class ElasticDAO(AbstractDAO):
     """Класс для работы с Elasticsearch."""
@@ -18,10 +36,10 @@ class ElasticDAO(AbstractDAO):
         self.elastic = elastic
 
     @backoff(ElasticsearchError)
-    async def get(self, table: str, id_obj: str) -> dict[str, str] | None:
-        """Получение объекта по id."""
+    async def get(self, table: str, id_obj: str, source: list[str] | None = None) -> dict[str, str] | None:
+        """Получение объекта по id, source ограничивает поля документа."""
         try:
-            doc = await self.elastic.get(index=table, id=id_obj)
+            doc = await self.elastic.get(index=table, id=id_obj, source_includes=source)
             return doc.get("_source")
         except NotFoundError:
             logger.warning(f"Объект в {table} не найден: id={id_obj}")
@@ -29,6 +47,22 @@ class ElasticDAO(AbstractDAO):
             logger.error(f"При запросе id={id_obj} к {table} произошла ошибка: {e}")
         return None
 
+    @backoff(ElasticsearchError)
+    async def get_many(self, table: str, ids: list[str], source: list[str] | None = None) -> list[dict[str, str]]:
+        """Получение объектов по списку id одним запросом _mget, source ограничивает поля документов."""
+        if not ids:
+            return []
+        try:
+            response = await self.elastic.mget(index=table, ids=ids, source_includes=source)
+        except TransportError as e:
+            logger.error(f"При запросе ids={ids} к {table} произошла ошибка: {e}")
+            return []
+
+        missing = [doc["_id"] for doc in response["docs"] if not doc.get("found")]
+        if missing:
+            logger.warning(f"Объекты в {table} не найдены: ids={missing}")
+        return [doc["_source"] for doc in response["docs"] if doc.get("found")]
+
     @backoff(ElasticsearchError)
     async def search(
         self,
@@ -37,8 +71,84 @@ class ElasticDAO(AbstractDAO):
         limit: int = 50,
         sort: list[dict[str, str]] | None = None,
         filters: dict[str, any] | None = None,
+        source: list[str] | None = None,
+        query: dict | None = None,
     ):
-        """Поиск объектов в таблице."""
+        """Поиск объектов в таблице, source ограничивает поля документов, query заменяет запрос по filters."""
+        search_query = {"size": limit, "from": offset, **self.build_query(sort, filters, source, query)}
+        try:
+            response = await self.elastic.search(index=table, body=search_query)
+            return [hit["_source"] for hit in response["hits"]["hits"]]
+        except NotFoundError:
+            logger.warning(f"Объекты в {table} не найдены: query={search_query}")
+        except TransportError as e:
+            logger.error(f"При запросе {search_query} к {table} произошла ошибка: {e}")
+        return []
+
+    @backoff(ElasticsearchError)
+    async def search_after(
+        self,
+        table: str,
+        cursor: str | None = None,
+        limit: int = 50,
+        sort: list[dict[str, str]] | None = None,
+        filters: dict[str, any] | None = None,
+        source: list[str] | None = None,
+        query: dict | None = None,
+    ) -> tuple[list[dict[str, str]], str | None]:
+        """
+        Поиск объектов в таблице с пагинацией search_after в точке во времени (PIT).
+        Без курсора открывается новая точка во времени. Каждая страница стоит одинаково на любой глубине
+        и не ограничена max_result_window. На последней странице точка во времени закрывается.
+        """
+        if cursor:
+            pit_id, after = decode_cursor(cursor)
+        else:
+            pit = await self.elastic.open_point_in_time(index=table, keep_alive=PIT_KEEP_ALIVE)
+            pit_id, after = pit["id"], None
+
+        search_query = {
+            "size": limit + 1,
+            "pit": {"id": pit_id, "keep_alive": PIT_KEEP_ALIVE},
+            **self.build_query([*(sort or [{"_score": "desc"}]), {"_shard_doc": "asc"}], filters, source, query),
+        }
+        if after:
+            search_query["search_after"] = after
+
+        try:
+            response = await self.elastic.search(body=search_query)
+        except NotFoundError as e:
+            logger.warning(f"Точка во времени для {table} устарела: cursor={cursor}")
+            raise InvalidCursorError(cursor) from e
+        except BadRequestError as e:
+            if not cursor:
+                raise
+            logger.warning(f"Курсор для {table} не принят: cursor={cursor}, {e}")
+            raise InvalidCursorError(cursor) from e
+        except TransportError as e:
+            logger.error(f"При запросе {search_query} к {table} произошла ошибка: {e}")
+            return [], None
+
+        hits = response["hits"]["hits"]
+        if len(hits) > limit:
+            next_cursor = encode_cursor(response["pit_id"], hits[limit - 1]["sort"])
+            return [hit["_source"] for hit in hits[:limit]], next_cursor
+
+        await self.elastic.close_point_in_time(id=response["pit_id"])
+        return [hit["_source"] for hit in hits], None
+
+    def build_query(
+        self,
+        sort: list[dict[str, str]] | None = None,
+        filters: dict[str, any] | None = None,
+        source: list[str] | None = None,
+        query: dict | None = None,
+    ) -> dict:
+        """
+        Тело поиска без пагинации: запрос, сортировка и проекция _source.
+        Фильтры Term и Range идут в контекст filter: без подсчёта релевантности и с кешем запросов узла.
+        Строки ищутся по тексту поля. Готовый query заменяет условия по строкам, но не Term и Range.
+        """
         must_conditions = []
 
         filter_conditions = []
@@ -47,12 +157,13 @@ class ElasticDAO(AbstractDAO):
             filters = {}
 
         search_query = {
-            "size": limit,
-            "from": offset,
             "query": {"bool": {"must": []}},
         }
 
         for key, value in filters.items():
+            if isinstance(value, Filter):
+                filter_conditions.append(self.filter_clause(key, value))
+                continue
             if key.count(".") == 1:
                 path = key.split(".")[0]
                 filter_conditions.append(
@@ -64,19 +175,32 @@ class ElasticDAO(AbstractDAO):
         if must_conditions:
             search_query["query"]["bool"]["must"] = must_conditions
 
+        if query:
+            search_query["query"] = {"bool": {"must": [query]}}
+
         if filter_conditions:
             search_query["query"]["bool"]["filter"] = filter_conditions
 
         if sort:
             search_query["sort"] = sort
-        try:
-            response = await self.elastic.search(index=table, body=search_query)
-            return [hit["_source"] for hit in response["hits"]["hits"]]
-        except NotFoundError:
-            logger.warning(f"Объекты в {table} не найдены: query={search_query}")
-        except TransportError as e:
-            logger.error(f"При запросе {search_query} к {table} произошла ошибка: {e}")
-        return []
+
+        if source:
+            search_query["_source"] = source
+
+        return search_query
+
+    @staticmethod
+    def filter_clause(key: str, value: Filter) -> dict:
+        """Условие term или range для поля key, внутри nested, если у фильтра указан path."""
+        if isinstance(value, Term):
+            clause = {"term": {key: value.value}}
+        else:
+            bounds = {"gte": value.gte, "lte": value.lte}
+            clause = {"range": {key: {bound: limit for bound, limit in bounds.items() if limit is not None}}}
+
+        if value.path:
+            return {"nested": {"path": value.path, "query": clause}}
+        return clause
 
 
 async def get_elastic(request: Request) -> ElasticDAO:
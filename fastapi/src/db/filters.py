@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Term:
+    """
+    Точное совпадение значения поля keyword.
+    Значение фильтра, в отличие от строки, не участвует в подсчёте релевантности.
+    path — путь вложенного (nested) объекта, которому принадлежит поле.
+    """
+
+    value: str
+    path: str | None = None
+
+
+@dataclass(frozen=True)
+class Range:
+    """Диапазон значений поля с включёнными границами, без границы — открытый."""
+
+    gte: float | None = None
+    lte: float | None = None
+    path: str | None = None
+
+
+Filter = Term | Range
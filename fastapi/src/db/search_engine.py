@@ -0,0 +1,66 @@
+from dataclasses import dataclass, field
+
+from src.db.abstract_db import AbstractDAO
+from src.db.filters import Filter
+
+
+@dataclass
+class SearchEngine:
+    """
+    Полнотекстовый поиск по релевантности поверх DAO.
+    Текст ищется запросом multi_match по полям fields с весами в виде "поле^вес", точные фильтры
+    Term и Range не влияют на релевантность. Результаты упорядочены по релевантности,
+    при равной релевантности и включённом tiebreak — по сортировке tiebreak.
+    """
+
+    db: AbstractDAO
+    fields: list[str]
+    tiebreak: list[dict[str, any]] = field(default_factory=list)
+
+    def query(self, text: str) -> dict:
+        return {"multi_match": {"query": text, "fields": self.fields, "type": "best_fields", "tie_breaker": 0.3}}
+
+    def sort(self, tiebreak: bool = True) -> list[dict[str, any]]:
+        return [{"_score": "desc"}, *(self.tiebreak if tiebreak else [])]
+
+    async def search(
+        self,
+        table: str,
+        text: str,
+        offset: int = 0,
+        limit: int = 50,
+        filters: dict[str, Filter] | None = None,
+        tiebreak: bool = True,
+        source: list[str] | None = None,
+    ) -> list[dict[str, str]]:
+        """Страница результатов по релевантности со смещением offset."""
+        return await self.db.search(
+            table=table,
+            offset=offset,
+            limit=limit,
+            sort=self.sort(tiebreak),
+            source=source,
+            filters=filters,
+            query=self.query(text),
+        )
+
+    async def search_after(
+        self,
+        table: str,
+        text: str,
+        cursor: str | None = None,
+        limit: int = 50,
+        filters: dict[str, Filter] | None = None,
+        tiebreak: bool = True,
+        source: list[str] | None = None,
+    ) -> tuple[list[dict[str, str]], str | None]:
+        """Страница результатов по релевантности по курсору, см. AbstractDAO.search_after."""
+        return await self.db.search_after(
+            table=table,
+            cursor=cursor,
+            limit=limit,
+            sort=self.sort(tiebreak),
+            source=source,
+            filters=filters,
+            query=self.query(text),
+        )
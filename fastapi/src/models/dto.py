@@ -8,3 +8,8 @@ class AbstractDTO(BaseModel):
         use_enum_values=True,
         arbitrary_types_allowed=True,
     )
+
+    @classmethod
+    def source_fields(cls) -> list[str]:
+        """Поля документа, из которых собирается модель: проекция _source для запросов к Elasticsearch."""
+        return [field.alias or name for name, field in cls.model_fields.items()]
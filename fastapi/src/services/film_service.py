@@ -1,14 +1,19 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import lru_cache
 from http import HTTPStatus
 from typing import List
 
-from src.db.abstract_db import AbstractDAO
+from src.db.abstract_db import AbstractDAO, InvalidCursorError
 from src.db.elastic_dao import ElasticDAO, get_elastic
+from src.db.filters import Filter, Range, Term
+from src.db.search_engine import SearchEngine
 from src.models.film import MovieBaseDTO, MovieInfoDTO
 
 from fastapi import Depends, HTTPException
 
+SEARCH_FIELDS = ["title^4", "actors_names^2", "directors_names^2", "writers_names^1.5", "description"]
+RATING_TIEBREAK = [{"imdb_rating": {"order": "desc", "missing": "_last"}}]
+
 
 @lru_cache()
 def get_film_service(
@@ -23,13 +28,17 @@ class FilmService:
 
     db: AbstractDAO
     index: str = "movies"
+    search_engine: SearchEngine = field(init=False)
+
+    def __post_init__(self):
+        self.search_engine = SearchEngine(self.db, fields=SEARCH_FIELDS, tiebreak=RATING_TIEBREAK)
 
     async def get_by_id(self, entity_id: str):
         """
         Получает объект по ID.
         """
 
-        doc = await self.db.get(table=self.index, id_obj=entity_id)
+        doc = await self.db.get(table=self.index, id_obj=entity_id, source=MovieInfoDTO.source_fields())
 
         if not doc:
             raise HTTPException(
@@ -38,35 +47,116 @@ class FilmService:
             )
         return MovieInfoDTO(**doc)
 
+    async def get_many(self, entity_ids: List[str]) -> List[MovieBaseDTO]:
+        """
+        Получает краткую информацию о фильмах по списку ID одним запросом.
+        """
+
+        docs = await self.db.get_many(table=self.index, ids=entity_ids, source=MovieBaseDTO.source_fields())
+        return [MovieBaseDTO(**doc) for doc in docs]
+
     async def search(
         self,
         genre: str | None = None,
+        genre_id: str | None = None,
+        rating_min: float | None = None,
+        rating_max: float | None = None,
         page_size: int = 50,
         page_number: int = 1,
         sort: str = "imdb_rating",
         title: str | None = None,
+        rating_tiebreak: bool = True,
     ) -> List[MovieBaseDTO]:
         """
         Получает список фильмов.
         с поддержкой фильтрации, сортировки и пагинации.
+        С title фильмы ищутся по релевантности, см. SearchEngine, и sort не применяется.
         """
 
-        filters = {}
-
-        if genre:
-            filters["genre.name"] = genre
         if title:
-            filters["title"] = title
-
-        response = await self.db.search(
-            table=self.index,
-            offset=(page_number - 1) * page_size,
-            limit=page_size,
-            sort=[{sort: "desc"}],
-            filters=filters,
-        )
+            response = await self.search_engine.search(
+                table=self.index,
+                text=title,
+                offset=(page_number - 1) * page_size,
+                limit=page_size,
+                filters=self.filters(genre, genre_id, rating_min, rating_max),
+                tiebreak=rating_tiebreak,
+                source=MovieBaseDTO.source_fields(),
+            )
+        else:
+            response = await self.db.search(
+                table=self.index,
+                offset=(page_number - 1) * page_size,
+                limit=page_size,
+                sort=[{sort: "desc"}],
+                filters=self.filters(genre, genre_id, rating_min, rating_max),
+                source=MovieBaseDTO.source_fields(),
+            )
 
         if not response:
             raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="films not found")
 
         return [MovieBaseDTO(**hit) for hit in response]
+
+    async def search_after(
+        self,
+        cursor: str | None = None,
+        genre: str | None = None,
+        genre_id: str | None = None,
+        rating_min: float | None = None,
+        rating_max: float | None = None,
+        page_size: int = 50,
+        sort: str = "imdb_rating",
+        title: str | None = None,
+        rating_tiebreak: bool = True,
+    ) -> tuple[List[MovieBaseDTO], str | None]:
+        """
+        Получает страницу фильмов по курсору и курсор следующей страницы.
+        """
+
+        try:
+            if title:
+                response, next_cursor = await self.search_engine.search_after(
+                    table=self.index,
+                    text=title,
+                    cursor=cursor,
+                    limit=page_size,
+                    filters=self.filters(genre, genre_id, rating_min, rating_max),
+                    tiebreak=rating_tiebreak,
+                    source=MovieBaseDTO.source_fields(),
+                )
+            else:
+                response, next_cursor = await self.db.search_after(
+                    table=self.index,
+                    cursor=cursor,
+                    limit=page_size,
+                    sort=[{sort: "desc"}],
+                    filters=self.filters(genre, genre_id, rating_min, rating_max),
+                    source=MovieBaseDTO.source_fields(),
+                )
+        except InvalidCursorError:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="invalid or expired cursor")
+
+        if not response:
+            raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="films not found")
+
+        return [MovieBaseDTO(**hit) for hit in response], next_cursor
+
+    @staticmethod
+    def filters(
+        genre: str | None = None,
+        genre_id: str | None = None,
+        rating_min: float | None = None,
+        rating_max: float | None = None,
+    ) -> dict[str, Filter]:
+        """Точные фильтры по жанру и диапазону рейтинга."""
+        filters = {}
+
+        if genre:
+            filters["genre.name.raw"] = Term(genre, path="genre")
+        if genre_id:
+            filters["genre.id"] = Term(genre_id, path="genre")
+        if rating_min is not None or rating_max is not None:
+            filters["imdb_rating"] = Range(gte=rating_min, lte=rating_max)
+
+        return filters
@@ -29,7 +29,7 @@ class GenreService:
         Получает жанр по ID.
         """
 
-        doc = await self.db.get(table=self.index, id_obj=entity_id)
+        doc = await self.db.get(table=self.index, id_obj=entity_id, source=GenreDTO.source_fields())
 
         if not doc:
             raise HTTPException(
@@ -58,6 +58,7 @@ class GenreService:
             limit=page_size,
             offset=offset,
             filters=filters,
+            source=GenreDTO.source_fields(),
         )
 
         if not response:
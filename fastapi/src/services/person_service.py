@@ -3,7 +3,7 @@ from functools import lru_cache
 from http import HTTPStatus
 from typing import List
 
-from src.db.abstract_db import AbstractDAO
+from src.db.abstract_db import AbstractDAO, InvalidCursorError
 from src.db.elastic_dao import ElasticDAO, get_elastic
 from src.models.person import PersonInfoDTO
 
@@ -29,7 +29,7 @@ class PersonService:
         Получает объект по ID.
         """
 
-        doc = await self.db.get(table=self.index, id_obj=entity_id)
+        doc = await self.db.get(table=self.index, id_obj=entity_id, source=PersonInfoDTO.source_fields())
 
         if not doc:
             raise HTTPException(
@@ -55,9 +55,33 @@ class PersonService:
             offset=(page_number - 1) * page_size,
             limit=page_size,
             filters=filters,
+            source=PersonInfoDTO.source_fields(),
         )
 
         if not response:
             raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="persons not found")
 
         return [PersonInfoDTO(**hit) for hit in response]
+
+    async def search_after(
+        self, cursor: str | None = None, page_size: int = 50, full_name: str | None = None
+    ) -> tuple[List[PersonInfoDTO], str | None]:
+        """
+        Выполняет поиск персон по имени с пагинацией по курсору.
+        """
+
+        try:
+            response, next_cursor = await self.db.search_after(
+                table=self.index,
+                cursor=cursor,
+                limit=page_size,
+                filters={"full_name": full_name} if full_name else {},
+                source=PersonInfoDTO.source_fields(),
+            )
+        except InvalidCursorError:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="invalid or expired cursor")
+
+        if not response:
+            raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="persons not found")
+
+        return [PersonInfoDTO(**hit) for hit in response], next_cursor
@@ -0,0 +1,9 @@
+from fastapi import Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def set_next_cursor(response: Response, next_cursor: str | None) -> None:
+    """Передаёт курсор следующей страницы в заголовке ответа, на последней странице заголовка нет."""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -54,6 +54,27 @@ def redis_clean(redis_client):
     return inner
 
 
+@pytest_asyncio.fixture(name="es_write_data")
+async def es_write_data(es_client):
+    """
+    Запись документов в индекс на время теста: после теста документы удаляются.
+    """
+    written = []
+
+    async def inner(index: str, documents: list[dict]):
+        for document in documents:
+            await es_client.index(index=index, id=document["id"], document=document)
+            written.append((index, document["id"]))
+        await es_client.indices.refresh(index=index)
+
+    yield inner
+
+    for index, document_id in written:
+        await es_client.delete(index=index, id=document_id)
+    for index in {index for index, _ in written}:
+        await es_client.indices.refresh(index=index)
+
+
 @pytest_asyncio.fixture(name="make_get_request")
 def make_get_request(aiohttp_client):
     """
@@ -67,3 +88,17 @@ def make_get_request(aiohttp_client):
             return (response.status, await response.json(), time.time() - time_start)
 
     return inner
+
+
+@pytest_asyncio.fixture(name="make_get_page")
+def make_get_page(aiohttp_client):
+    """
+    Получение страницы по endpoint вместе с заголовками ответа: курсор следующей страницы передаётся в заголовке.
+    """
+
+    async def inner(endpoint: str, query_data: dict = None):
+        url = f"{service_settings.dsn}/api/v1/{endpoint}"
+        async with aiohttp_client.get(url, params=query_data) as response:
+            return (response.status, await response.json(), response.headers)
+
+    return inner
@@ -124,3 +124,56 @@ async def test_movies_sorting_and_filtering_invalid_params(make_get_request, que
         assert response_status == HTTPStatus.NOT_FOUND, "Ожидали статус NOT_FOUND при поиске недействительного жанра."
     else:
         assert False, "Неизвестный параметр, не удалось проверить ввод."
+
+
+def matches_filters(movie: dict, query_data: dict) -> bool:
+    """Подходит ли фильм под фильтры genre, genre_id, rating_min и rating_max."""
+    genre_matches = any(
+        genre["name"].lower() == query_data.get("genre", genre["name"]).lower()
+        and genre["id"] == query_data.get("genre_id", genre["id"])
+        for genre in movie["genre"]
+    )
+    if "rating_min" not in query_data and "rating_max" not in query_data:
+        return genre_matches
+    rating = movie["imdb_rating"]
+    return genre_matches and rating is not None and query_data["rating_min"] <= rating <= query_data["rating_max"]
+
+
+@pytest.mark.parametrize(
+    "query_data",
+    [
+        {"genre": "action"},
+        {"genre_id": "3d8d9bf5-0d90-4353-88ba-4ccc5d2c07ff"},
+        {"genre": "Action", "rating_min": 7, "rating_max": 8},
+    ],
+)
+async def test_movies_exact_filters(make_get_request, query_data):
+    """Тестирование точных фильтров по названию или id жанра и диапазону рейтинга."""
+    response_status, json_response, _ = await make_get_request(MOVIES_URL, {**query_data, "page_size": 1000})
+    expected = {movie["id"] for movie in MOVIES if matches_filters(movie, query_data)}
+
+    assert response_status == HTTPStatus.OK, "Ожидали статус OK для точных фильтров."
+    assert {movie["id"] for movie in json_response} == expected, "Ожидали фильмы, подходящие под все фильтры."
+
+
+async def test_films_cursor_pagination(make_get_page):
+    """Тестирование постраничного обхода всех фильмов по курсору: каждый фильм встречается ровно один раз."""
+    films, cursor = [], ""
+    while cursor is not None:
+        response_status, json_response, headers = await make_get_page(MOVIES_URL, {"page_size": 7, "cursor": cursor})
+        assert response_status == HTTPStatus.OK, "Ожидали статус OK для страницы по курсору."
+        assert len(json_response) <= 7, "Ожидали страницу не больше page_size."
+        films.extend(movie["id"] for movie in json_response)
+        cursor = headers.get("X-Next-Cursor")
+
+    assert len(films) == len(set(films)), "Ожидали, что фильмы на разных страницах не повторяются."
+    assert set(films) == {movie["id"] for movie in MOVIES}, "Ожидали, что обход по курсору вернёт все фильмы."
+
+
+@pytest.mark.parametrize("cursor", ["недействительный курсор", "eyJwaXQiOiAiMCIsICJhZnRlciI6IFtdfQ=="])
+async def test_films_invalid_cursor(make_get_request, cursor):
+    """Тестирование ответа на повреждённый или устаревший курсор."""
+    response_status, response_data, _ = await make_get_request(MOVIES_URL, {"cursor": cursor})
+
+    assert response_status == HTTPStatus.BAD_REQUEST, "Ожидали статус BAD_REQUEST для недействительного курсора."
+    assert response_data == {"detail": "invalid or expired cursor"}, f"Получили {response_data}."
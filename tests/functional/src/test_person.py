@@ -72,3 +72,17 @@ async def test_person_film(make_get_request, redis_clean):
         f"Проверьте, что get-запрос в Redis к `/api/v1/{endpoint}` "
         f"возвращает ответ, как в get-запросе в ElasticSearch."
     )
+
+
+@pytest.mark.asyncio
+async def test_person_film_order(make_get_request, redis_clean):
+    """Проверка, что фильмы персоны идут в порядке её фильмов."""
+    endpoint = f"persons/{PERSONS[0]['id']}/film"
+    await redis_clean()
+    status, body, timestamp = await make_get_request(endpoint)
+    assert status == HTTPStatus.OK, (
+        f"Проверьте, что get-запрос к `/api/v1/{endpoint}` " f"возвращает ответ с кодом 200."
+    )
+    assert [film["id"] for film in body] == [film["id"] for film in PERSONS[0]["films"]], (
+        f"Проверьте, что get-запрос к `/api/v1/{endpoint}` " f"возвращает фильмы в порядке фильмов персоны."
+    )
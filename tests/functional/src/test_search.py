@@ -1,6 +1,8 @@
+from http import HTTPStatus
+
 import pytest
 
-from tests.functional.testdata.test_param.search_param import SEARCH_PARAM
+from tests.functional.testdata.test_param.search_param import RANKING_MOVIES, RANKING_QUERY, SEARCH_PARAM
 
 
 @pytest.mark.parametrize("query_data, expected_answer, index, endpoint", SEARCH_PARAM)
@@ -39,3 +41,20 @@ async def test_films_search(make_get_request, redis_clean, query_data, expected_
             f"Проверьте, что get-запрос в Redis к `/api/v1/{endpoint}` "
             f"возвращает ответ, как в get-запросе в ElasticSearch."
         )
+
+
+@pytest.mark.asyncio
+async def test_films_search_title_boost(make_get_request, redis_clean, es_write_data):
+    """
+    Тестирование порядка выдачи 'films/search/': фильм со словом в названии
+    идёт выше фильма, где слово встречается только в описании.
+    """
+    await redis_clean()
+    await es_write_data("movies", RANKING_MOVIES)
+
+    status, body, _ = await make_get_request("films/search/", RANKING_QUERY)
+
+    assert status == HTTPStatus.OK, "Проверьте, что get-запрос к `/api/v1/films/search/` возвращает ответ с кодом 200."
+    assert [film["id"] for film in body] == [movie["id"] for movie in RANKING_MOVIES], (
+        "Проверьте, что совпадение в названии фильма ранжируется выше совпадения только в описании."
+    )
@@ -32,7 +32,14 @@ MOVIES_INDEX_MAPPING = {
             "genre": {
                 "type": "nested",
                 "dynamic": "strict",
-                "properties": {"id": {"type": "keyword"}, "name": {"type": "text", "analyzer": "ru_en"}},
+                "properties": {
+                    "id": {"type": "keyword"},
+                    "name": {
+                        "type": "text",
+                        "analyzer": "ru_en",
+                        "fields": {"raw": {"type": "keyword", "normalizer": "lowercase"}},
+                    },
+                },
             },
             "title": {"type": "text", "analyzer": "ru_en", "fields": {"raw": {"type": "keyword"}}},
             "description": {"type": "text", "analyzer": "ru_en"},
@@ -26,6 +26,11 @@ SEARCH_PARAM = [
         {"status": HTTPStatus.OK, "length": 49},
     ]
     + FILMS_PARAM,
+    [
+        {"query": "The Star", "rating_tiebreak": "false"},
+        {"status": HTTPStatus.OK, "length": 50},
+    ]
+    + FILMS_PARAM,
     [
         {},
         {"status": HTTPStatus.OK, "length": 50},
@@ -62,3 +67,36 @@ SEARCH_PARAM = [
     ]
     + PERSONS_PARAM,
 ]
+
+# Слово есть в названии одного фильма и только в описании другого, у которого выше рейтинг:
+# порядок выдачи задают веса полей SEARCH_FIELDS, а не сортировка по рейтингу.
+RANKING_QUERY = {"query": "Zephyrine"}
+
+RANKING_MOVIES = [
+    {
+        "id": "0b7f0b8e-5c1a-4e52-9d7e-3a1f6c2d9e01",
+        "imdb_rating": 5.1,
+        "title": "Zephyrine",
+        "description": "A lighthouse keeper waits for a ship that never comes.",
+        "genre": [],
+        "directors_names": [],
+        "actors_names": [],
+        "writers_names": [],
+        "directors": [],
+        "actors": [],
+        "writers": [],
+    },
+    {
+        "id": "0b7f0b8e-5c1a-4e52-9d7e-3a1f6c2d9e02",
+        "imdb_rating": 9.4,
+        "title": "Harbour Lights",
+        "description": "The old ship Zephyrine returns to the harbour after forty years at sea.",
+        "genre": [],
+        "directors_names": [],
+        "actors_names": [],
+        "writers_names": [],
+        "directors": [],
+        "actors": [],
+        "writers": [],
+    },
+]